@@ -0,0 +1,48 @@
+"""
+Measure rolling-origin backtest throughput for a growing number of worker processes.
+
+    python benchmarks/bench_backtest.py --wells 2000 --jobs 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.backtest import rolling_origin_backtest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=2000)
+    parser.add_argument('--months', type=int, default=120)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--pipeline', default='stub', help="registry pipeline used for the Chronos model")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n_rows = args.wells * args.months
+    df = pd.DataFrame({
+        'well_name': np.repeat([f'W{i}' for i in range(args.wells)], args.months),
+        'period': np.tile(pd.date_range('2000-01-01', periods=args.months, freq='MS'), args.wells),
+        'months_since_first_production': np.tile(np.arange(args.months), args.wells),
+        'oil': rng.uniform(100, 1000, n_rows),
+    })
+    wells = list(df.well_name.unique())
+
+    baseline = None
+    for n_jobs in args.jobs:
+        start = time.perf_counter()
+        results = rolling_origin_backtest(df, wells, n_jobs=n_jobs, pipeline_name=args.pipeline)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"n_jobs={n_jobs}: {len(results)} evaluations in {elapsed:.2f}s "
+              f"({len(results) / elapsed:.0f}/s, {baseline / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
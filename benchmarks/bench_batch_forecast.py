@@ -0,0 +1,47 @@
+"""
+Compare one ``pipeline.predict`` call per well against batched forecasting.
+
+Runs on CPU against the local stub pipeline, e.g.::
+
+    python benchmarks/bench_batch_forecast.py --wells 2000 --batch-size 64
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.predict_model import forecast_wells
+from src.models.stub_pipeline import StubChronosPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--prediction-length', type=int, default=12)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    histories = {f'W{i}': rng.uniform(100, 1000, size=rng.integers(24, 240)) for i in range(args.wells)}
+    pipeline = StubChronosPipeline(context_length=512, hidden_size=256)
+
+    start = time.perf_counter()
+    for well, history in histories.items():
+        forecast_wells(pipeline, {well: history}, args.prediction_length)
+    per_well = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecast_wells(pipeline, histories, args.prediction_length, batch_size=args.batch_size)
+    batched = time.perf_counter() - start
+
+    print(f"{args.wells} wells, batch size {args.batch_size}")
+    print(f"One call per well: {per_well:.3f}s")
+    print(f"Batched:           {batched:.3f}s ({per_well / batched:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare per-well sklearn fits against the batched least-squares engine.
+
+    python benchmarks/bench_batch_regression.py --wells 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import PolynomialFeatures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.batch_regression import evaluate_polynomial_batch
+from src.models.train_model import split_train_test, train_and_evaluate_single_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    splits = {}
+    for i in range(args.wells):
+        n_months = int(rng.integers(24, 240))
+        months = np.arange(n_months)
+        oil = 5000 * np.exp(-0.02 * months) * rng.uniform(0.8, 1.2, n_months)
+        splits[f'W{i}'] = split_train_test({'months_since_first_production': months, 'oil': oil})
+
+    models = {
+        'Linear': LinearRegression(),
+        'Polynomial (Degree 2)': (PolynomialFeatures(degree=2), LinearRegression()),
+        'Polynomial (Degree 3)': (PolynomialFeatures(degree=3), LinearRegression()),
+    }
+    start = time.perf_counter()
+    expected = {name: {well: train_and_evaluate_single_model(model, name, *split) for well, split in splits.items()}
+                for name, model in models.items()}
+    sklearn_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = evaluate_polynomial_batch(splits, {'Linear': 1, 'Polynomial (Degree 2)': 2, 'Polynomial (Degree 3)': 3})
+    batch_time = time.perf_counter() - start
+
+    worst = max(abs(batched[name][well] - expected[name][well]) / expected[name][well]
+                for name in models for well in splits)
+    print(f"{args.wells} wells, 3 models")
+    print(f"sklearn, one fit per well: {sklearn_time:.2f}s")
+    print(f"Batched least squares:     {batch_time:.3f}s ({sklearn_time / batch_time:.0f}x faster)")
+    print(f"Largest relative RMSE difference: {worst:.2e}")
+
+
+if __name__ == '__main__':
+    main()
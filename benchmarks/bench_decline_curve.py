@@ -0,0 +1,41 @@
+"""
+Time the batched Arps fit across many wells.
+
+    python benchmarks/bench_decline_curve.py --wells 5000 --months 120
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.decline_curve import arps_rate, fit_arps_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=5000)
+    parser.add_argument('--months', type=int, default=120)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    qi = rng.uniform(500, 20000, args.wells)
+    di = rng.uniform(0.01, 0.3, args.wells)
+    b = rng.uniform(0.1, 1.5, args.wells)
+    t = np.tile(np.arange(args.months, dtype=float), (args.wells, 1))
+    mask = t < rng.integers(24, args.months, args.wells)[:, None]
+    q = arps_rate(t, qi[:, None], di[:, None], b[:, None]) * rng.uniform(0.9, 1.1, t.shape)
+
+    for kind in ('exponential', 'harmonic', 'hyperbolic'):
+        start = time.perf_counter()
+        fit = fit_arps_batch(t, q, mask, kind)
+        elapsed = time.perf_counter() - start
+        print(f"{kind:>11}: {args.wells} wells in {elapsed:.2f}s, median |di error| "
+              f"{np.median(np.abs(fit['di'] - di) / di):.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare a cold CSV load against a warm load from the binary cache.
+
+    python benchmarks/bench_load_cache.py --wells 5000 --months 240
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.make_dataset import read_production_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=5000)
+    parser.add_argument('--months', type=int, default=240)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n_rows = args.wells * args.months
+    df = pd.DataFrame({
+        'oil': rng.uniform(0, 10000, n_rows).round(3),
+        'gas_total': rng.uniform(0, 300000, n_rows),
+        'period': np.tile(pd.date_range('1990-01-01', periods=args.months, freq='MS').strftime('%Y-%m-%d'), args.wells),
+        'well_name': np.repeat([f'FIELD{i}' for i in range(args.wells)], args.months),
+    }, index=np.arange(1, n_rows + 1))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(tmp_dir, 'production.csv')
+        df.to_csv(csv_path)
+        size_mb = os.path.getsize(csv_path) / 1e6
+
+        start = time.perf_counter()
+        read_production_csv(csv_path)
+        csv_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read_production_csv(csv_path, use_cache=True, rebuild_cache=True)
+        cold_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read_production_csv(csv_path, use_cache=True)
+        warm_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print(f"{n_rows} rows ({size_mb:.0f} MB CSV)")
+    print(f"CSV parse, no cache:      {csv_time:.2f}s")
+    print(f"Cold load (parse + cache): {cold_time:.2f}s")
+    print(f"Warm load (memory-mapped): {warm_time:.3f}s ({csv_time / warm_time:.0f}x faster than parsing)")
+
+
+if __name__ == '__main__':
+    main()
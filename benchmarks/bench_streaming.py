@@ -0,0 +1,79 @@
+"""
+Compare peak memory of the in-memory load and pivot against the streaming reader.
+
+    python benchmarks/bench_streaming.py --wells 5000 --months 240
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.make_dataset import load_and_preprocess_data
+from src.data.streaming import ProductionStream
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=5000)
+    parser.add_argument('--months', type=int, default=240)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--partition-mb', type=int, default=16)
+    args = parser.parse_args()
+
+    # Wells come online at staggered dates, so the pivot is mostly NaN as in a real basin
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, args.months * 4, args.wells)
+    periods = pd.date_range('1970-01-01', periods=args.months * 5, freq='MS')
+    n_rows = args.wells * args.months
+    df = pd.DataFrame({
+        'oil': rng.uniform(0, 10000, n_rows).round(3),
+        'gas_total': rng.uniform(0, 300000, n_rows),
+        'period': periods[(starts[:, None] + np.arange(args.months)).ravel()].strftime('%Y-%m-%d'),
+        'well_name': np.repeat([f'FIELD{i}' for i in range(args.wells)], args.months),
+    }, index=np.arange(1, n_rows + 1))
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(tmp_dir, 'production.csv')
+        df.to_csv(csv_path)
+        del df
+        size_mb = os.path.getsize(csv_path) / 1e6
+
+        in_memory_time, in_memory_peak = _measure(lambda: load_and_preprocess_data(csv_path))
+
+        def stream():
+            with ProductionStream(csv_path, chunksize=args.chunksize, partition_bytes=args.partition_mb << 20,
+                                  tmp_dir=tmp_dir) as production:
+                production.field_totals
+                for _ in production.iter_processed_wells():
+                    pass
+
+        stream_time, stream_peak = _measure(stream)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print(f"{n_rows} rows ({size_mb:.0f} MB CSV)")
+    print(f"In memory (frame + pivot):        {in_memory_time:.2f}s, peak {in_memory_peak:.0f} MB")
+    print(f"Streaming (totals + well frames): {stream_time:.2f}s, peak {stream_peak:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare per-well boolean-mask scans against WellStore lookups.
+
+    python benchmarks/bench_well_store.py --wells 10000 --months 60
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.make_dataset import WellStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wells', type=int, default=10000)
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--lookups', type=int, default=1000,
+                        help='number of wells looked up with the boolean mask (extrapolated to all wells)')
+    args = parser.parse_args()
+
+    wells = np.array([f'WELL{i}' for i in range(args.wells)])
+    df = pd.DataFrame({
+        'well_name': np.repeat(wells, args.months),
+        'months_since_first_production': np.tile(np.arange(args.months), args.wells),
+        'oil': np.random.default_rng(0).uniform(0, 1000, args.wells * args.months),
+    }).sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+    sample = wells[:args.lookups]
+    start = time.perf_counter()
+    for well in sample:
+        df[df.well_name == well].oil.values
+    mask_time = (time.perf_counter() - start) * args.wells / len(sample)
+
+    start = time.perf_counter()
+    store = WellStore.from_frame(df)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for well in wells:
+        store.get(well, 'oil')
+    lookup_time = time.perf_counter() - start
+
+    print(f"{args.wells} wells x {args.months} months ({len(df)} rows)")
+    print(f"Boolean mask, all wells (extrapolated): {mask_time:.2f}s")
+    print(f"WellStore build:                        {build_time:.3f}s")
+    print(f"WellStore lookups, all wells:           {lookup_time:.4f}s")
+    print(f"Speedup including build: {mask_time / (build_time + lookup_time):.0f}x")
+
+
+if __name__ == '__main__':
+    main()
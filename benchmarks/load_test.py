@@ -0,0 +1,111 @@
+"""
+Load-test the forecast service and report p50/p99 latency and throughput.
+
+    python benchmarks/load_test.py --requests 2000 --concurrency 64
+    python benchmarks/load_test.py --url 127.0.0.1:8765 --wells FIELD4 FIELD55D
+
+Without ``--url`` an in-process server with the stub pipeline is started on
+a free port, serving synthetic wells. ``--repeat-fraction`` of the requests
+ask for a well that was already requested, exercising the forecast cache.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.serving import ForecastServer, ForecastService, request_forecast
+
+
+async def _get(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+async def _client(host, port, payloads, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for payload in payloads:
+            start = time.perf_counter()
+            status, _ = await request_forecast(reader, writer, payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    rng = np.random.default_rng(0)
+    server = None
+    if args.url:
+        host, port = args.url.rsplit(':', 1)
+        port = int(port)
+        wells = args.wells or [None]
+        histories = None
+    else:
+        histories = {f'W{i}': rng.uniform(100, 1000, size=rng.integers(24, 120)).tolist()
+                     for i in range(args.unique_wells)}
+        wells = list(histories)
+        service = ForecastService('stub', prediction_length=args.horizon, max_batch_size=args.max_batch_size,
+                                  max_wait_ms=args.max_wait_ms, num_samples=args.num_samples)
+        server = ForecastServer(service, histories)
+        await server.start(port=0)
+        host, port = '127.0.0.1', server.port
+
+    # Fresh histories keep most requests out of the cache; repeats hit it
+    payloads = []
+    for i in range(args.requests):
+        if histories is None:
+            payloads.append({'well': wells[i % len(wells)], 'horizon': args.horizon})
+        elif rng.random() < args.repeat_fraction:
+            payloads.append({'well': wells[rng.integers(len(wells))], 'horizon': args.horizon})
+        else:
+            payloads.append({'history': rng.uniform(100, 1000, size=rng.integers(24, 120)).tolist(),
+                             'horizon': args.horizon})
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, payloads[i::args.concurrency], latencies, errors)
+                           for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = await _get(host, port, '/stats')
+    if server is not None:
+        await server.stop()
+
+    latencies = np.array(latencies) * 1000
+    print(f"{len(latencies)} requests, concurrency {args.concurrency}, {len(errors)} errors")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"Latency: p50 {np.percentile(latencies, 50):.1f} ms, p99 {np.percentile(latencies, 99):.1f} ms, "
+          f"max {latencies.max():.1f} ms")
+    if stats.get('batches'):
+        print(f"Server: {stats['batches']} batches (mean size {stats['batched_requests'] / stats['batches']:.1f}), "
+              f"{stats['cache_hits']} cache hits, {stats['inference_s']:.2f}s in inference")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="host:port of a running server (default: start one with the stub pipeline)")
+    parser.add_argument('--wells', nargs='+', help="wells to request from a running server")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--unique-wells', type=int, default=200)
+    parser.add_argument('--repeat-fraction', type=float, default=0.2)
+    parser.add_argument('--horizon', type=int, default=6)
+    parser.add_argument('--num-samples', type=int, default=24)
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
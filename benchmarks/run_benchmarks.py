@@ -0,0 +1,189 @@
+"""
+Time every pipeline stage on synthetic fields of growing size and flag regressions.
+
+    python benchmarks/run_benchmarks.py --sizes 100x60 500x120 2000x240
+
+Each run is appended to benchmarks/results/history.jsonl; every stage's best
+time is compared with the median of the previous runs on the same machine,
+and stages that got slower than ``--tolerance`` are flagged. Chronos is
+replaced by the deterministic stub pipeline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.make_dataset import WellStore, load_and_preprocess_data
+from src.data.synthetic import generate_production, write_production_csv
+from src.features.build_features import calculate_well_characteristics, filter_and_process_data
+from src.features.field_aggregates import compute_field_aggregates
+from src.features.quality import build_monthly_grid, flag_production_quality
+from src.models.train_model import train_and_evaluate_models
+from src.visualization.visualize import (plot_cumulative_production, plot_gor, plot_oil_production_for_wells,
+                                         plot_producing_wells, plot_top_5_wells, plot_total_production)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time(func, repeat, work_dir):
+    """
+    Best wall time of ``func(scratch_dir)`` over ``repeat`` runs, each with a fresh scratch directory.
+    """
+    best = None
+    for _ in range(repeat):
+        scratch = tempfile.mkdtemp(dir=work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                result = func(scratch)
+                elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(scratch)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_size(n_wells, n_months, repeat, work_dir, plots=True):
+    """
+    Time each stage on one synthetic field, feeding every stage the previous one's output.
+    """
+    csv_path = write_production_csv(generate_production(n_wells, n_months), os.path.join(work_dir, 'production.csv'))
+    timings, errors = {}, {}
+
+    def stage(name, func):
+        timings[name], result = _time(func, repeat, work_dir)
+        return result
+
+    def plot_stage(name, func):
+        # Plot export needs optional renderers (kaleido); record failures instead of aborting the run
+        try:
+            stage(name, func)
+        except Exception as e:
+            message = next((line.strip() for line in str(e).splitlines() if line.strip()), '')
+            errors[name] = f'{type(e).__name__}: {message}'
+
+    df, _ = stage('load_and_preprocess_data', lambda _: load_and_preprocess_data(csv_path))
+    aggregates = stage('compute_field_aggregates', lambda _: compute_field_aggregates(df))
+    flags = stage('flag_production_quality', lambda _: flag_production_quality(df))
+    stage('build_monthly_grid', lambda _: build_monthly_grid(df, flags=flags))
+    well_characteristics = stage('calculate_well_characteristics', lambda _: calculate_well_characteristics(df))
+    df_filtered, well_list = stage('filter_and_process_data',
+                                   lambda _: filter_and_process_data(df, well_characteristics))
+    store = stage('WellStore.from_frame', lambda _: WellStore.from_frame(df_filtered))
+    stage('train_and_evaluate_models',
+          lambda scratch: train_and_evaluate_models(store, well_list, cache_dir=scratch, pipeline_name='stub'))
+
+    if plots:
+        plot_stage('plot_oil_production_for_wells',
+                   lambda scratch: plot_oil_production_for_wells(store, list(well_list[:10]), scratch))
+        plot_stage('plot_top_5_wells', lambda scratch: plot_top_5_wells(df_filtered, scratch))
+        plot_stage('plot_cumulative_production', lambda scratch: plot_cumulative_production(df_filtered, scratch))
+        plot_stage('plot_total_production', lambda scratch: plot_total_production(aggregates, 'oil', scratch))
+        plot_stage('plot_producing_wells', lambda scratch: plot_producing_wells(aggregates, scratch))
+        plot_stage('plot_gor', lambda scratch: plot_gor(aggregates, scratch))
+
+    return {'rows': len(df), 'wells': n_wells, 'months': n_months, 'filtered_wells': len(well_list),
+            'seconds': timings, 'errors': errors}
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_regressions(run, history, tolerance=0.2, min_seconds=0.01, window=5):
+    """
+    Compare a run with the median of the last ``window`` runs on the same machine.
+
+    Returns ``(size, stage, baseline, current)`` tuples for stages that are
+    more than ``tolerance`` (relative) and ``min_seconds`` (absolute) slower.
+    """
+    previous = [record for record in history if record['machine'] == run['machine']][-window:]
+    regressions = []
+    for size, result in run['sizes'].items():
+        for stage_name, current in result['seconds'].items():
+            past = [record['sizes'][size]['seconds'][stage_name] for record in previous
+                    if stage_name in record['sizes'].get(size, {}).get('seconds', {})]
+            if not past:
+                continue
+            baseline = statistics.median(past)
+            if current > baseline * (1 + tolerance) and current - baseline > min_seconds:
+                regressions.append((size, stage_name, baseline, current))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['100x60', '500x120', '2000x240'],
+                        help="field sizes as WELLSxMONTHS")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage; the best time is kept")
+    parser.add_argument('--no-plots', action='store_true', help="skip the plotting stages")
+    parser.add_argument('--history', default=os.path.join(RESULTS_DIR, 'history.jsonl'))
+    parser.add_argument('--tolerance', type=float, default=0.2, help="relative slowdown flagged as a regression")
+    parser.add_argument('--window', type=int, default=5, help="previous runs in the baseline median")
+    parser.add_argument('--no-save', action='store_true', help="do not append this run to the history")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit with status 1 on regressions")
+    args = parser.parse_args()
+
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'machine': f'{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu',
+        'python': sys.version.split()[0],
+        'sizes': {},
+    }
+    work_dir = tempfile.mkdtemp()
+    try:
+        for size in args.sizes:
+            n_wells, n_months = (int(v) for v in size.lower().split('x'))
+            result = run_size(n_wells, n_months, args.repeat, work_dir, plots=not args.no_plots)
+            run['sizes'][size] = result
+            print(f"\n{size}: {result['rows']} rows, {result['filtered_wells']} wells after filtering")
+            for stage_name, seconds in result['seconds'].items():
+                print(f"  {stage_name:<32}{seconds:10.4f}s")
+            for stage_name, error in result['errors'].items():
+                print(f"  {stage_name:<32}    failed: {error}")
+    finally:
+        shutil.rmtree(work_dir)
+
+    history = load_history(args.history)
+    regressions = find_regressions(run, history, args.tolerance, window=args.window)
+    if not args.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        print(f"\nResults appended to {args.history}")
+
+    if regressions:
+        print("\nRegressions:")
+        for size, stage_name, baseline, current in regressions:
+            print(f"  {size} {stage_name}: {baseline:.4f}s -> {current:.4f}s ({current / baseline:.2f}x)")
+        if args.fail_on_regression:
+            sys.exit(1)
+    elif history:
+        print("\nNo regressions against previous runs.")
+
+
+if __name__ == '__main__':
+    main()
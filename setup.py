@@ -18,4 +18,5 @@ setup(
         'chronos @ git+https://github.com/amazon-science/chronos-forecasting.git@96cedec3fa9795c9bd58650080643e2b68bd3a6e'
     ],
     python_requires='>=3.8',
+    entry_points={'console_scripts': ['production-forecast=src.cli:main']},
 )
\ No newline at end of file
@@ -1,14 +1,19 @@
-# This can often be left empty for simple projects
-# You can optionally use it to define what should be imported when someone does `from src import *`
+# Subpackages and the helpers below are imported on first access (PEP 562),
+# so `import src` stays cheap and jobs that only load data or build
+# features never import torch or the plotting libraries.
 
-from . import data
-from . import features
-from . import models
-from . import visualization
+from ._lazy import lazy_exports
 
-# If you want to make certain functions easily accessible, you can import them here
-from .models.predict_model import predict_oil_production
-from .visualization.visualize import plot_oil_production
+__all__ = ['data', 'features', 'models', 'visualization', 'predict_oil_production', 'plot_oil_production']
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    'data': None,
+    'features': None,
+    'models': None,
+    'visualization': None,
+    'predict_oil_production': '.models.predict_model',
+    'plot_oil_production': '.visualization.visualize',
+})
 
 # You can also define a version for your package
-__version__ = '0.1.0'
\ No newline at end of file
+__version__ = '0.1.0'
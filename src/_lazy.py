@@ -0,0 +1,26 @@
+import importlib
+
+def lazy_exports(namespace, exports):
+    """
+    Build PEP 562 ``__getattr__`` and ``__dir__`` hooks for the package whose ``globals()`` is ``namespace``.
+
+    ``exports`` maps each public name to the submodule that defines it
+    (relative, e.g. ``'.make_dataset'``), or to ``None`` for a submodule
+    exported under its own name. The submodule is imported on first
+    access and the value is cached in the package namespace, so importing
+    the package itself only costs what it imports eagerly.
+    """
+    package = namespace['__name__']
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(exports[name] or f'.{name}', package)
+        value = module if exports[name] is None else getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
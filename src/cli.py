@@ -0,0 +1,287 @@
+"""
+Command-line entry point: run the analysis as a graph of stages driven by a config file.
+
+    python -m src.cli --config config/pipeline.json
+    python -m src.cli --config config/pipeline.json --only train decline_curves
+    python -m src.cli --config config/pipeline.json --from filter --force
+"""
+import argparse
+import copy
+import json
+import os
+
+from .instrumentation import RunReport
+from .pipeline import Stage, run_stages, select_stages, topological_order
+
+DEFAULT_CONFIG = {
+    'data_path': 'data/raw/test.csv',
+    'output_dir': 'outputs',
+    'use_cache': True,
+    'wells': {
+        # Restrict the analysis to these wells (all wells with 24+ months by default)
+        'include': None,
+        # Keep only the first N of them
+        'subset_size': None,
+        # Wells with an individual oil production plot
+        'plot': [],
+        # Wells forecast with Chronos
+        'predict': [],
+    },
+    'models': None,
+    'pipeline': 'chronos',
+    'horizon': 6,
+    'chronos_batch_size': 32,
+    'forecast': {
+        # Sample paths drawn per well and the quantiles kept from them
+        'num_samples': 24,
+        'quantiles': [0.1, 0.5, 0.9],
+        # Sample paths behind the Chronos point forecast in model evaluation
+        'evaluation_samples': 1,
+    },
+    'quality': {
+        # Shut-in and missing months on the monthly grid: 'mask' (NaN) or 'zero'
+        'shut_in': 'mask',
+        'mask_outliers': False,
+        'outlier_threshold': 3.5,
+        # Column 0 of the grid: 'first_production', 'last_production' or 'calendar'
+        'align': 'first_production',
+    },
+    'workers': {'stages': 2, 'plots': 1},
+    'decline_curve': {'kind': 'hyperbolic', 'economic_limit': 1.0},
+}
+
+def _merge(base, override):
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def load_config(path=None, base_dir=None):
+    """
+    Load a JSON (or, with PyYAML installed, YAML) config over ``DEFAULT_CONFIG``.
+
+    Relative ``data_path`` and ``output_dir`` are resolved against ``base_dir``
+    (the current directory by default).
+    """
+    config = DEFAULT_CONFIG
+    if path is not None:
+        with open(path) as f:
+            if path.endswith(('.yaml', '.yml')):
+                import yaml
+                overrides = yaml.safe_load(f) or {}
+            else:
+                overrides = json.load(f)
+        unknown = sorted(set(overrides) - set(DEFAULT_CONFIG))
+        if unknown:
+            raise ValueError(f"Unknown config keys {unknown}")
+        config = _merge(DEFAULT_CONFIG, overrides)
+    else:
+        config = copy.deepcopy(config)
+    base_dir = base_dir or os.getcwd()
+    for key in ('data_path', 'output_dir'):
+        config[key] = os.path.join(base_dir, config[key])
+    return config
+
+def _selected_wells(well_list, wells_config):
+    if wells_config['include'] is not None:
+        include = set(wells_config['include'])
+        well_list = well_list[well_list.isin(include)]
+    if wells_config['subset_size'] is not None:
+        well_list = well_list[:wells_config['subset_size']]
+    return well_list
+
+def build_stages(config, force=False):
+    """
+    Build the analysis stage graph for a config.
+
+    load -> field_aggregates -> field_plots
+         -> quality
+         -> characteristics -> filter -> well_plots, train, decline_curves, predict
+
+    The field plots and everything after ``filter`` are independent of each
+    other, so they run concurrently with ``workers.stages`` threads. With
+    ``force`` the plotting stages re-render figures whose inputs are unchanged.
+    """
+    from .data.make_dataset import WellStore, file_fingerprint, load_and_preprocess_data
+
+    output_dir = config['output_dir']
+    figures_dir = os.path.join(output_dir, 'figures')
+    wells_config = config['wells']
+    plot_jobs = config['workers']['plots']
+    forecast_config = config['forecast']
+
+    def load(context):
+        df, _ = load_and_preprocess_data(config['data_path'], use_cache=config['use_cache'], build_pivot=False)
+        return {'df': df}
+
+    def field_aggregates(context):
+        from .features.field_aggregates import load_field_aggregates
+        return {'field_aggregates': load_field_aggregates(context['df'], config['data_path'])}
+
+    def characteristics(context):
+        from .features.build_features import calculate_well_characteristics
+        return {'well_characteristics': calculate_well_characteristics(context['df'])}
+
+    def quality(context):
+        from .features.quality import build_monthly_grid, flag_production_quality, summarize_production_quality
+        quality_config = config['quality']
+        flags = flag_production_quality(context['df'], outlier_threshold=quality_config['outlier_threshold'])
+        summary = summarize_production_quality(flags)
+        summary.to_csv(os.path.join(output_dir, 'data_quality.csv'), index_label='well_name')
+        grid = build_monthly_grid(context['df'], shut_in=quality_config['shut_in'],
+                                  mask_outliers=quality_config['mask_outliers'], align=quality_config['align'],
+                                  flags=flags)
+        grid.save(os.path.join(output_dir, 'monthly_grid.npz'))
+        return {'data_quality': summary, 'monthly_grid': grid}
+
+    def filter_wells(context):
+        from .features.build_features import filter_and_process_data
+        df_filtered, well_list = filter_and_process_data(context['df'], context['well_characteristics'])
+        return {'df_filtered': df_filtered, 'well_list': _selected_wells(well_list, wells_config),
+                'well_store': WellStore.from_frame(df_filtered)}
+
+    def field_plots(context):
+        from .visualization.visualize import plot_gor, plot_producing_wells, plot_total_production
+        aggregates = context['field_aggregates']
+        plot_total_production(aggregates, 'oil', figures_dir, force=force)
+        plot_total_production(aggregates, 'gas_total', figures_dir, force=force)
+        plot_producing_wells(aggregates, figures_dir, force=force)
+        plot_gor(aggregates, figures_dir, force=force)
+
+    def well_plots(context):
+        from .visualization.visualize import (plot_cumulative_production, plot_oil_production_for_wells,
+                                              plot_top_5_wells)
+        plot_oil_production_for_wells(context['well_store'], wells_config['plot'], figures_dir, n_jobs=plot_jobs,
+                                      force=force)
+        plot_top_5_wells(context['df_filtered'], figures_dir, force=force)
+        plot_cumulative_production(context['df_filtered'], figures_dir, force=force)
+
+    def train(context):
+        from .models.train_model import train_and_evaluate_models
+        from .visualization.visualize import plot_model_comparison
+        results_df = train_and_evaluate_models(context['well_store'], context['well_list'],
+                                               cache_dir=os.path.join(output_dir, 'model_cache'),
+                                               chronos_batch_size=config['chronos_batch_size'],
+                                               pipeline_name=config['pipeline'], models=config['models'],
+                                               chronos_num_samples=forecast_config['evaluation_samples'])
+        results_df.to_csv(os.path.join(output_dir, 'model_results.csv'), index_label='well_name')
+        plot_model_comparison(results_df, figures_dir, force=force)
+        return {'results_df': results_df}
+
+    def decline_curves(context):
+        from .models.decline_curve import fit_decline_curves
+        curves = fit_decline_curves(context['well_store'], context['well_list'], **config['decline_curve'])
+        curves.to_csv(os.path.join(output_dir, 'decline_curves.csv'))
+        return {'decline_curves': curves}
+
+    def predict(context):
+        from .models.forecast_store import QuantileForecasts
+        from .models.predict_model import predict_oil_production_for_wells
+        from .models.registry import get_pipeline
+        wells = [well for well in wells_config['predict'] if well in set(context['well_list'])]
+        for well in sorted(set(wells_config['predict']) - set(wells)):
+            print(f"Skipping prediction for {well} as it's not in the processed subset.")
+        quantile_levels = sorted(forecast_config['quantiles'])
+        forecasts = {}
+        if wells:
+            forecasts = predict_oil_production_for_wells(wells, context['well_store'], get_pipeline(config['pipeline']),
+                                                         figures_dir, prediction_length=config['horizon'],
+                                                         batch_size=config['chronos_batch_size'], n_jobs=plot_jobs,
+                                                         num_samples=forecast_config['num_samples'],
+                                                         quantile_levels=quantile_levels, force=force)
+        store = QuantileForecasts.from_dict(forecasts, quantile_levels,
+                                            meta={'pipeline': config['pipeline'], 'horizon': config['horizon'],
+                                                  'num_samples': forecast_config['num_samples']})
+        store.save(os.path.join(output_dir, 'forecasts'))
+        return {'forecasts': store}
+
+    def figure(name):
+        return os.path.join(figures_dir, name)
+
+    source = {'data_path': config['data_path'], 'use_cache': config['use_cache']}
+    if os.path.exists(config['data_path']):
+        # Content only, so touching the file without changing it does not rerun anything
+        fingerprint = file_fingerprint(config['data_path'])
+        source['content'] = (fingerprint['size'], fingerprint['sha256'])
+    selection = (wells_config['include'], wells_config['subset_size'])
+    return [
+        Stage('load', load, params=source),
+        Stage('field_aggregates', field_aggregates, deps=('load',)),
+        Stage('characteristics', characteristics, deps=('load',)),
+        Stage('quality', quality, deps=('load',), params=config['quality'],
+              outputs=(os.path.join(output_dir, 'data_quality.csv'), os.path.join(output_dir, 'monthly_grid.npz'))),
+        Stage('filter', filter_wells, deps=('load', 'characteristics'), params=selection),
+        Stage('field_plots', field_plots, deps=('field_aggregates',),
+              outputs=tuple(figure(name) for name in ('total_oil_production.png', 'total_gas_total_production.png',
+                                                      'producing_wells.png', 'gor.png'))),
+        Stage('well_plots', well_plots, deps=('filter',), params=wells_config['plot'],
+              outputs=tuple(figure(f'oil_production_{well}.png') for well in wells_config['plot'])
+              + (figure('top_5_wells.png'), figure('cumulative_production.png'))),
+        Stage('train', train, deps=('filter',),
+              params=(config['models'], config['pipeline'], config['chronos_batch_size'],
+                      forecast_config['evaluation_samples']),
+              outputs=(os.path.join(output_dir, 'model_results.csv'), figure('model_comparison.png'))),
+        Stage('decline_curves', decline_curves, deps=('filter',), params=config['decline_curve'],
+              outputs=(os.path.join(output_dir, 'decline_curves.csv'),)),
+        Stage('predict', predict, deps=('filter',),
+              params=(wells_config['predict'], config['pipeline'], config['horizon'], forecast_config['num_samples'],
+                      sorted(forecast_config['quantiles'])),
+              outputs=(os.path.join(output_dir, 'forecasts', 'meta.json'),)),
+    ]
+
+def run(config, only=None, start=None, force=False, profile=None, trace_memory=False, report_path=None):
+    """
+    Run the stages selected by ``only``/``start`` and write the JSON run report.
+
+    Stages named in ``only``, and the ``start`` stage, rerun even when up to
+    date; the stages after ``start`` only rerun when their inputs changed.
+
+    Returns ``(ran, skipped)`` stage names.
+    """
+    stages = build_stages(config, force=force)
+    selected = select_stages(stages, only=only, start=start)
+    output_dir = config['output_dir']
+    os.makedirs(os.path.join(output_dir, 'figures'), exist_ok=True)
+    report = RunReport(trace_memory=trace_memory, profile=profile, profile_dir=os.path.join(output_dir, 'profiles'))
+    try:
+        with report:
+            ran, skipped = run_stages(stages, selected=selected,
+                                      state_path=os.path.join(output_dir, '.pipeline_state.json'),
+                                      max_workers=config['workers']['stages'], force=force, report=report,
+                                      forced=set(only or ()) | ({start} if start else set()))
+        report.metrics.update(stages_run=ran, stages_skipped=skipped)
+    finally:
+        report_file = report.write(report_path or os.path.join(output_dir, 'run_report.json'))
+        print(f"Run report saved in: {report_file}")
+    return ran, skipped
+
+def main(argv=None, base_dir=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', help="JSON or YAML pipeline config (defaults apply for missing keys)")
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help="run exactly these stages, even if up to date (upstream stages rerun only as needed)")
+    parser.add_argument('--from', dest='start', metavar='STAGE', help="rerun this stage and run everything after it whose inputs changed")
+    parser.add_argument('--force', action='store_true', help="rerun stages even if their inputs are unchanged")
+    parser.add_argument('--list', action='store_true', help="list the stages and exit")
+    parser.add_argument('--workers', type=int, help="override workers.stages from the config")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help="dump a profile of each stage to <output_dir>/profiles")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="record tracemalloc allocation deltas per stage (slower)")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config, base_dir=base_dir)
+    if args.workers is not None:
+        config['workers']['stages'] = args.workers
+    if args.list:
+        for stage in topological_order(build_stages(config)):
+            deps = f" (after {', '.join(stage.deps)})" if stage.deps else ''
+            print(f"{stage.name}{deps}")
+        return
+    run(config, only=args.only, start=args.start, force=args.force, profile=args.profile,
+        trace_memory=args.trace_memory)
+
+if __name__ == '__main__':
+    main()
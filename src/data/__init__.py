@@ -1,3 +1,19 @@
-from .make_dataset import load_and_preprocess_data
+from .._lazy import lazy_exports
 
-# You can also import other functions from make_dataset.py if needed
\ No newline at end of file
+__all__ = ['load_and_preprocess_data', 'read_production_csv', 'WellStore', 'select_well', 'file_fingerprint',
+           'ProductionState', 'update_production_state', 'ProductionStream', 'stream_production_csv',
+           'generate_production', 'write_production_csv']
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    'load_and_preprocess_data': '.make_dataset',
+    'read_production_csv': '.make_dataset',
+    'WellStore': '.make_dataset',
+    'select_well': '.make_dataset',
+    'file_fingerprint': '.make_dataset',
+    'ProductionState': '.incremental',
+    'update_production_state': '.incremental',
+    'ProductionStream': '.streaming',
+    'stream_production_csv': '.streaming',
+    'generate_production': '.synthetic',
+    'write_production_csv': '.synthetic',
+})
@@ -0,0 +1,146 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .make_dataset import read_production_csv
+from ..features.build_features import month_index, process_production_rows
+
+class ProductionState:
+    """
+    Processed production history that can be extended one monthly file at a time.
+
+    Holds the raw long-format rows, the processed producing rows (as built by
+    ``filter_and_process_data``) and per-well running state: first production
+    date, last processed period, row count and cumulative oil. ``update`` only
+    touches the wells present in the new rows and records them in ``dirty``;
+    every other well keeps its processed rows and downstream results.
+    """
+
+    def __init__(self, df, processed, wells, dirty=None):
+        self.df = df
+        self.processed = processed
+        self.wells = wells
+        self.dirty = set(dirty or ())
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build the state from a full history, marking every well dirty.
+        """
+        processed = process_production_rows(df)
+        state = cls(df, processed, _summarize_wells(df, processed))
+        state.dirty = set(state.wells.index)
+        return state
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    def update(self, new_df):
+        """
+        Add new rows and reprocess only the wells they belong to.
+
+        Rows that extend a well past its last processed period are appended
+        using the stored first production date and running cumulative total.
+        New wells, backfilled or restated periods trigger a rebuild of that
+        well alone. Returns the set of affected wells.
+        """
+        new_df = new_df.sort_values(by='period')
+        if len(self.df) and new_df['period'].min() < self.df['period'].max():
+            self.df = pd.concat([self.df, new_df]).sort_values(by='period', kind='stable').reset_index(drop=True)
+        else:
+            self.df = pd.concat([self.df, new_df], ignore_index=True)
+
+        affected = set(new_df['well_name'].unique())
+        new_rows = process_production_rows(new_df)
+        rebuild = set()
+        appended = []
+        for well, rows in new_rows.groupby('well_name', observed=True, sort=False):
+            if well not in self.wells.index or pd.isna(self.wells.at[well, 'last_period']) \
+                    or rows['period'].min() <= self.wells.at[well, 'last_period'] \
+                    or rows['period'].duplicated().any():
+                rebuild.add(well)
+                continue
+            first = self.wells.at[well, 'first_production']
+            rows = rows.copy()
+            rows['months_since_first_production'] = month_index(rows['period']) - month_index([first])[0]
+            running = np.concatenate([[self.wells.at[well, 'cumulative_oil']], rows['oil'].values])
+            rows['cumulative_oil_production'] = np.cumsum(running)[1:]
+            appended.append(rows)
+
+        if rebuild:
+            self.processed = self.processed[~self.processed.well_name.isin(rebuild)]
+            appended.append(process_production_rows(self.df[self.df.well_name.isin(rebuild)]))
+        if appended:
+            self.processed = pd.concat([self.processed] + appended)
+
+        self.wells = _summarize_wells(self.df, self.processed, self.wells, affected)
+        self.dirty |= affected
+        return affected
+
+    def filtered(self, min_months=24):
+        """
+        Return ``(df_filtered, well_list)`` as ``filter_and_process_data`` would for the full history.
+        """
+        well_list = self.wells.index[self.wells['num_months'] >= min_months]
+        df_ = self.processed[self.processed.well_name.isin(well_list)]
+        df_ = df_.sort_values(by=['well_name', 'period'], kind='stable').reset_index(drop=True)
+        return df_, well_list
+
+    def mark_clean(self, wells=None):
+        """
+        Mark wells (all by default) as having up-to-date downstream results.
+        """
+        if wells is None:
+            self.dirty.clear()
+        else:
+            self.dirty -= set(wells)
+
+    def is_dirty(self, well_name):
+        return well_name in self.dirty
+
+def _summarize_wells(df, processed, wells=None, affected=None):
+    """
+    Compute per-well running state, for all wells or only ``affected`` ones.
+    """
+    if affected is not None:
+        df = df[df.well_name.isin(affected)]
+        processed = processed[processed.well_name.isin(affected)]
+    producing = processed.groupby('well_name', observed=True)
+    summary = pd.DataFrame({
+        'num_months': df.groupby('well_name', observed=True)['period'].count(),
+        'first_production': producing['period'].min(),
+        'last_period': producing['period'].max(),
+        'cumulative_oil': producing['cumulative_oil_production'].last(),
+    })
+    summary['cumulative_oil'] = summary['cumulative_oil'].fillna(0.0)
+    if wells is None:
+        return summary.sort_index()
+    return pd.concat([wells.drop(summary.index, errors='ignore'), summary]).sort_index()
+
+def update_production_state(new_file_path, state_path, history_file_path=None):
+    """
+    Apply a new monthly production file to the persisted state and save it.
+
+    If no state exists yet it is built from ``history_file_path`` first.
+    Returns the updated ``ProductionState``; its ``dirty`` set lists the
+    wells whose downstream results need recomputing.
+    """
+    if os.path.exists(state_path):
+        state = ProductionState.load(state_path)
+    elif history_file_path is not None:
+        state = ProductionState.from_frame(read_production_csv(history_file_path))
+    else:
+        raise FileNotFoundError(f"No production state at {state_path} and no history file to build it from.")
+
+    affected = state.update(read_production_csv(new_file_path))
+    print(f"Updated {len(affected)} wells from {new_file_path}; {len(state.dirty)} wells need recomputing")
+    state.save(state_path)
+    return state
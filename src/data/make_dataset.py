@@ -1,25 +1,200 @@
+import hashlib
+import json
+import shutil
+import numpy as np
 import pandas as pd
 import os
 
-def load_and_preprocess_data(file_path=None):
+class WellStore:
     """
-    Load data from CSV and preprocess it.
+    Columnar, well-indexed copy of a long-format production frame.
+
+    Rows are stably sorted by well name into contiguous NumPy arrays, one per
+    column, and ``offsets`` maps each well to its ``(start, stop)`` slice.
+    Looking up a well is a dict access and returns zero-copy views, instead
+    of a boolean-mask scan over the whole frame. Row order within a well is
+    the order of the source frame.
+    """
+
+    def __init__(self, columns, offsets, well_column='well_name'):
+        self.columns = columns
+        self.offsets = offsets
+        self.well_column = well_column
+
+    @classmethod
+    def from_frame(cls, df, well_column='well_name'):
+        """
+        Build a store from a DataFrame with one row per well and period.
+        """
+        codes, wells = pd.factorize(df[well_column], sort=True)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(wells) + 1))
+        columns = {
+            column: np.ascontiguousarray(df[column].to_numpy()[order])
+            for column in df.columns if column != well_column
+        }
+        offsets = {well: (bounds[i], bounds[i + 1]) for i, well in enumerate(wells)}
+        return cls(columns, offsets, well_column)
+
+    @property
+    def wells(self):
+        return list(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, well_name):
+        return well_name in self.offsets
+
+    def get(self, well_name, column):
+        """
+        Return a view of one column for a well.
+        """
+        start, stop = self.offsets[well_name]
+        return self.columns[column][start:stop]
+
+    def well(self, well_name):
+        """
+        Return a dict of column views for a well.
+        """
+        start, stop = self.offsets[well_name]
+        return {column: values[start:stop] for column, values in self.columns.items()}
+
+    def frame(self, well_name):
+        """
+        Return a well's rows as a DataFrame, including the well name column.
+        """
+        frame = pd.DataFrame(self.well(well_name), copy=False)
+        frame.insert(0, self.well_column, well_name)
+        return frame
+
+def select_well(data, well_name):
+    """
+    Return a well's rows from either a WellStore or a long-format DataFrame.
+    """
+    if isinstance(data, WellStore):
+        if well_name not in data:
+            return pd.DataFrame(columns=[data.well_column] + list(data.columns))
+        return data.frame(well_name)
+    return data[data['well_name'] == well_name]
+
+def file_fingerprint(file_path, with_hash=True):
+    """
+    Return the size, mtime and (optionally) SHA-256 of a file.
+    """
+    stat = os.stat(file_path)
+    fingerprint = {'size': stat.st_size, 'mtime': stat.st_mtime}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        fingerprint['sha256'] = digest.hexdigest()
+    return fingerprint
+
+def cache_dir_for(file_path):
+    """
+    Return the binary cache directory that sits next to a source file.
+    """
+    return f"{file_path}.cache"
+
+def _cache_is_valid(file_path, cache_dir):
+    """
+    Check a cache against its source file.
+
+    A matching size and mtime is trusted as is. If only the mtime changed the
+    file is re-hashed, and a matching hash refreshes the stored mtime.
+    """
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    current = file_fingerprint(file_path, with_hash=False)
+    if current['size'] != meta['source']['size']:
+        return False
+    if current['mtime'] == meta['source']['mtime']:
+        return True
+    if file_fingerprint(file_path)['sha256'] != meta['source']['sha256']:
+        return False
+    meta['source']['mtime'] = current['mtime']
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+    return True
+
+def write_binary_cache(df, file_path):
+    """
+    Write a typed, column-per-file cache of a production frame next to its source.
+
+    ``well_name`` is stored as int32 codes plus sorted categories, ``period``
+    as datetime64 and float columns as float32, each as an ``.npy`` file that
+    can be memory-mapped.
+    """
+    cache_dir = cache_dir_for(file_path)
+    tmp_dir = f"{cache_dir}.tmp{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column == 'well_name' or values.dtype == object or isinstance(values.dtype, pd.CategoricalDtype):
+            categorical = pd.Categorical(values)
+            categorical = categorical.reorder_categories(sorted(categorical.categories))
+            np.save(os.path.join(tmp_dir, f'{column}.npy'), categorical.codes.astype(np.int32))
+            with open(os.path.join(tmp_dir, f'{column}.categories.json'), 'w') as f:
+                json.dump([str(c) for c in categorical.categories], f)
+            columns[column] = 'category'
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            np.save(os.path.join(tmp_dir, f'{column}.npy'), values.to_numpy(dtype='datetime64[ns]'))
+            columns[column] = 'datetime64[ns]'
+        elif pd.api.types.is_float_dtype(values):
+            np.save(os.path.join(tmp_dir, f'{column}.npy'), values.to_numpy(dtype=np.float32))
+            columns[column] = 'float32'
+        else:
+            np.save(os.path.join(tmp_dir, f'{column}.npy'), values.to_numpy())
+            columns[column] = str(values.dtype)
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump({'source': file_fingerprint(file_path), 'columns': columns}, f)
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.replace(tmp_dir, cache_dir)
+    return cache_dir
+
+def read_binary_cache(cache_dir):
+    """
+    Load a binary cache, memory-mapping the numeric columns.
+    """
+    with open(os.path.join(cache_dir, 'meta.json')) as f:
+        meta = json.load(f)
+    data = {}
+    for column, dtype in meta['columns'].items():
+        values = np.load(os.path.join(cache_dir, f'{column}.npy'), mmap_mode='r')
+        if dtype == 'category':
+            with open(os.path.join(cache_dir, f'{column}.categories.json')) as f:
+                categories = json.load(f)
+            data[column] = pd.Categorical.from_codes(values, categories=categories)
+        else:
+            data[column] = values
+    return pd.DataFrame(data, copy=False)
+
+def read_production_csv(file_path, use_cache=False, rebuild_cache=False):
+    """
+    Read a production CSV into a long-format frame sorted by period.
+
+    With ``use_cache`` the parsed frame is kept in a binary cache next to the
+    source (see ``write_binary_cache``) and later calls load it instead of
+    parsing the CSV, as long as the source's size and content are unchanged.
+    Cached frames have a categorical ``well_name`` and float32 values.
+    ``rebuild_cache`` forces the cache to be rewritten.
     """
-    if file_path is None:
-        # Construct the path to the data file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-        
-        # Ensure the project root is named 'production_forecasting'
-        if os.path.basename(project_root) != 'production_forecasting':
-            raise RuntimeError("The project root directory must be named 'production_forecasting'")
-        
-        file_path = os.path.join(project_root, 'data', 'raw', 'test.csv')
-    
     # Check if the file exists
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file {file_path} does not exist. Please check the file path.")
     
+    cache_dir = cache_dir_for(file_path)
+    if use_cache and not rebuild_cache and _cache_is_valid(file_path, cache_dir):
+        print(f"Loading cached data for {file_path} from: {cache_dir}")
+        return read_binary_cache(cache_dir)
+    
     print(f"Attempting to load data from: {file_path}")
     
     # Load the data
@@ -33,9 +208,41 @@ def load_and_preprocess_data(file_path=None):
     df['period'] = pd.to_datetime(df['period'])
     df = df.sort_values(by='period').reset_index(drop=True)
     
+    if use_cache:
+        write_binary_cache(df, file_path)
+        print(f"Binary cache written to: {cache_dir}")
+        return read_binary_cache(cache_dir)
+    return df
+
+def load_and_preprocess_data(file_path=None, use_cache=False, rebuild_cache=False, build_pivot=True):
+    """
+    Load data from CSV and preprocess it.
+
+    ``use_cache`` and ``rebuild_cache`` control the binary cache, see ``read_production_csv``.
+    With ``build_pivot=False`` the dense ``period`` x ``well_name`` pivot is
+    skipped and ``None`` is returned in its place; field-level series come
+    from ``src.features.compute_field_aggregates`` instead.
+    """
+    if file_path is None:
+        # Construct the path to the data file
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+        
+        # Ensure the project root is named 'production_forecasting'
+        if os.path.basename(project_root) != 'production_forecasting':
+            raise RuntimeError("The project root directory must be named 'production_forecasting'")
+        
+        file_path = os.path.join(project_root, 'data', 'raw', 'test.csv')
+    
+    df = read_production_csv(file_path, use_cache=use_cache, rebuild_cache=rebuild_cache)
+    
+    if not build_pivot:
+        return df, None
+
     series = df.pivot_table(index='period', 
                             values=['oil', 'gas_total'], 
-                            columns='well_name')
+                            columns='well_name',
+                            observed=True)
     
     return df, series
 
@@ -0,0 +1,156 @@
+import math
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ..features.build_features import calculate_well_characteristics, filter_and_process_data
+from ..features.field_aggregates import FIELD_COLUMNS, add_gor, field_totals
+
+class ProductionStream:
+    """
+    Two-pass, bounded-memory reader for production CSVs larger than memory.
+
+    The first pass reads the CSV ``chunksize`` rows at a time, adds each
+    chunk's field totals to a small per-period frame and appends its rows to
+    on-disk partitions keyed by a hash of the well name, so every well lands
+    in exactly one partition. The number of partitions grows with the file
+    size so that each holds about ``partition_bytes`` of CSV. The second pass
+    loads one partition at a time and yields per-well frames. Peak memory is
+    one chunk or one partition plus the per-period totals, never the whole
+    file or the dense ``period`` x ``well_name`` pivot.
+
+    Use as a context manager, or call ``close`` to remove the partitions.
+    """
+
+    def __init__(self, file_path, chunksize=100_000, partition_bytes=64 << 20, tmp_dir=None):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"The file {file_path} does not exist. Please check the file path.")
+        self.file_path = file_path
+        self.chunksize = chunksize
+        self.n_partitions = max(1, math.ceil(os.path.getsize(file_path) / partition_bytes))
+        self.tmp_dir = tmp_dir
+        self.partition_dir = None
+        self._field_totals = None
+        self._oil_sum = 0.0
+        self._oil_count = 0
+        self.well_characteristics = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.partition_dir is not None and os.path.exists(self.partition_dir):
+            shutil.rmtree(self.partition_dir)
+        self.partition_dir = None
+
+    def _partition_path(self, i):
+        return os.path.join(self.partition_dir, f'part-{i:05d}.pkl')
+
+    def partition(self):
+        """
+        Run the first pass, unless it has already run.
+        """
+        if self.partition_dir is not None:
+            return
+        self.partition_dir = tempfile.mkdtemp(prefix='production_stream_', dir=self.tmp_dir)
+        totals = None
+        for chunk in pd.read_csv(self.file_path, index_col=0, chunksize=self.chunksize):
+            chunk['period'] = pd.to_datetime(chunk['period'])
+            chunk_totals = field_totals(chunk)
+            totals = chunk_totals if totals is None else totals.add(chunk_totals, fill_value=0)
+            self._oil_sum += chunk['oil'].sum()
+            self._oil_count += int(chunk['oil'].count())
+
+            keys = pd.util.hash_array(chunk['well_name'].to_numpy(dtype=object)) % self.n_partitions
+            for key, rows in chunk.groupby(keys):
+                with open(self._partition_path(key), 'ab') as f:
+                    pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if totals is None:
+            totals = pd.DataFrame(columns=FIELD_COLUMNS, index=pd.DatetimeIndex([], name='period'))
+        self._field_totals = totals.sort_index().astype({'producing_wells': np.int64})
+
+    @property
+    def field_totals(self):
+        """
+        Per-period field totals (see ``field_totals``) for the whole file.
+        """
+        self.partition()
+        return self._field_totals
+
+    @property
+    def field_aggregates(self):
+        """
+        Field totals with the field GOR, as ``compute_field_aggregates`` returns.
+        """
+        return add_gor(self.field_totals)
+
+    @property
+    def field_oil_mean(self):
+        """
+        Mean oil rate over all rows, as used for the wells' gas/oil ratios.
+        """
+        self.partition()
+        return self._oil_sum / self._oil_count if self._oil_count else np.nan
+
+    def iter_partitions(self):
+        """
+        Yield each partition as a frame of whole wells, sorted by period.
+        """
+        self.partition()
+        for i in range(self.n_partitions):
+            path = self._partition_path(i)
+            if not os.path.exists(path):
+                continue
+            pieces = []
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        pieces.append(pickle.load(f))
+                    except EOFError:
+                        break
+            yield pd.concat(pieces).sort_values(by='period', kind='stable').reset_index(drop=True)
+
+    def iter_wells(self):
+        """
+        Yield ``(well_name, frame)`` for every well's raw rows, sorted by period.
+        """
+        for part in self.iter_partitions():
+            for well_name, frame in part.groupby('well_name', sort=True):
+                yield well_name, frame.reset_index(drop=True)
+
+    def iter_processed_wells(self):
+        """
+        Yield ``(well_name, frame)`` for every well kept by ``filter_and_process_data``.
+
+        Frames match that function's output for the well. The wells'
+        characteristics are collected in ``well_characteristics`` once the
+        generator is exhausted.
+        """
+        characteristics = []
+        field_oil_mean = self.field_oil_mean
+        for part in self.iter_partitions():
+            well_characteristics = calculate_well_characteristics(part, field_oil_mean=field_oil_mean)
+            characteristics.append(well_characteristics)
+            df_filtered, _ = filter_and_process_data(part, well_characteristics)
+            for well_name, frame in df_filtered.groupby('well_name', sort=True):
+                yield well_name, frame
+        if characteristics:
+            self.well_characteristics = pd.concat(characteristics).sort_index()
+
+def stream_production_csv(file_path, chunksize=100_000, partition_bytes=64 << 20, tmp_dir=None):
+    """
+    Yield ``(well_name, frame)`` for every well of a production CSV in bounded memory.
+
+    Generator wrapper around ``ProductionStream.iter_wells`` that removes the
+    partitions when done.
+    """
+    with ProductionStream(file_path, chunksize, partition_bytes, tmp_dir) as stream:
+        yield from stream.iter_wells()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+def generate_production(n_wells, n_months, seed=0, start='1990-01-01', stagger_months=None,
+                        gap_rate=0.03, shut_in_rate=0.02, noise=0.1):
+    """
+    Generate a synthetic field in the schema of ``data/raw/test.csv``.
+
+    Each of ``n_wells`` wells produces for ``n_months`` months, starting at a
+    random month within the first ``stagger_months`` (half of ``n_months`` by
+    default) so the field's period x well pivot is sparse like a real one.
+    Oil follows a hyperbolic Arps decline with random initial rate, decline
+    and b-factor plus log-normal noise; gas is oil times a per-well GOR that
+    slowly rises. A ``shut_in_rate`` fraction of months report zero oil and
+    gas, and a ``gap_rate`` fraction of months are missing altogether.
+
+    Returns a frame with ``oil``, ``gas_total``, ``period`` and ``well_name``
+    columns and a 1-based index, as written by ``write_production_csv``.
+    """
+    rng = np.random.default_rng(seed)
+    if stagger_months is None:
+        stagger_months = max(1, n_months // 2)
+
+    first = rng.integers(0, stagger_months, n_wells)
+    qi = rng.lognormal(np.log(5000), 0.8, n_wells)
+    di = rng.uniform(0.02, 0.15, n_wells)
+    b = rng.uniform(0.3, 1.5, n_wells)
+    gor = rng.lognormal(np.log(20), 0.5, n_wells)
+
+    well = np.repeat(np.arange(n_wells), n_months)
+    t = np.tile(np.arange(n_months), n_wells)
+    oil = qi[well] * (1 + b[well] * di[well] * t) ** (-1 / b[well]) * rng.lognormal(0, noise, len(t))
+    gas = oil * gor[well] * (1 + 0.01 * t) * rng.lognormal(0, noise, len(t))
+
+    shut_in = rng.random(len(t)) < shut_in_rate
+    oil[shut_in] = 0.0
+    gas[shut_in] = 0.0
+    keep = rng.random(len(t)) >= gap_rate
+
+    periods = pd.date_range(start, periods=stagger_months + n_months, freq='MS')
+    df = pd.DataFrame({
+        'oil': oil[keep].round(3),
+        'gas_total': gas[keep],
+        'period': periods[(first[well] + t)[keep]],
+        'well_name': np.array([f'FIELD{i}' for i in range(n_wells)])[well[keep]],
+    })
+    df.index = np.arange(1, len(df) + 1)
+    return df
+
+def write_production_csv(df, file_path):
+    """
+    Write a production frame as CSV in the layout ``read_production_csv`` expects.
+    """
+    df.to_csv(file_path, date_format='%Y-%m-%d')
+    return file_path
@@ -1 +1,23 @@
-from .build_features import calculate_gas_decline_rate, calculate_well_characteristics, filter_and_process_data
\ No newline at end of file
+from .._lazy import lazy_exports
+
+__all__ = ['calculate_gas_decline_rate', 'calculate_gas_decline_rates', 'calculate_well_characteristics',
+           'filter_and_process_data', 'month_index', 'process_production_rows', 'compute_field_aggregates',
+           'field_aggregates_from_pivot', 'field_totals', 'load_field_aggregates', 'MonthlyGrid',
+           'build_monthly_grid', 'flag_production_quality', 'summarize_production_quality']
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    'calculate_gas_decline_rate': '.build_features',
+    'calculate_gas_decline_rates': '.build_features',
+    'calculate_well_characteristics': '.build_features',
+    'filter_and_process_data': '.build_features',
+    'month_index': '.build_features',
+    'process_production_rows': '.build_features',
+    'compute_field_aggregates': '.field_aggregates',
+    'field_aggregates_from_pivot': '.field_aggregates',
+    'field_totals': '.field_aggregates',
+    'load_field_aggregates': '.field_aggregates',
+    'MonthlyGrid': '.quality',
+    'build_monthly_grid': '.quality',
+    'flag_production_quality': '.quality',
+    'summarize_production_quality': '.quality',
+})
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def calculate_gas_decline_rate(gas_data):
@@ -8,16 +9,63 @@ def calculate_gas_decline_rate(gas_data):
     decline_rate = (gas_diff.values / (gas_data[:-1].values + 1e-6)) * 100
     return decline_rate.mean()
 
-def calculate_well_characteristics(df):
+def calculate_gas_decline_rates(df):
+    """
+    Calculate the average month-over-month gas decline rate for every well at once.
+
+    Vectorized equivalent of applying ``calculate_gas_decline_rate`` per well:
+    each row is compared with the previous row of the same well, in frame order.
+    """
+    gas = df['gas_total']
+    previous = df.groupby('well_name', observed=True)['gas_total'].shift(1)
+    decline_rate = ((gas - previous) / (previous + 1e-6)) * 100
+    return decline_rate.groupby(df['well_name'], observed=True).mean()
+
+def calculate_well_characteristics(df, field_oil_mean=None):
     """
     Calculate various characteristics for each well.
+
+    The gas/oil ratio is relative to the mean oil rate of ``df``, or of
+    ``field_oil_mean`` when ``df`` holds only part of the field.
+    """
+    if field_oil_mean is None:
+        field_oil_mean = df['oil'].mean()
+    grouped = df.groupby('well_name', observed=True)
+    return pd.DataFrame({
+        'average_gas_oil_ratio': grouped['gas_total'].mean() / field_oil_mean,
+        'num_months': grouped['period'].count(),
+        'initial_oil_date': grouped['period'].min(),
+        'average_gas_decline_rate': calculate_gas_decline_rates(df),
+    })
+
+def month_index(period):
+    """
+    Calendar month of each period as an int64 count of months since 1970-01.
+
+    Differences are whole calendar months whatever the day of the month, so
+    offsets computed from it do not drift the way ``// pd.Timedelta('30D')`` does.
+    """
+    values = np.asarray(pd.to_datetime(period), dtype='datetime64[ns]')
+    return values.astype('datetime64[M]').astype(np.int64)
+
+def process_production_rows(df):
+    """
+    Keep producing months and add months since first production and cumulative oil per well.
+
+    Months since first production count calendar months (see ``month_index``).
     """
-    return df.groupby('well_name').agg(
-        average_gas_oil_ratio=pd.NamedAgg(column='gas_total', aggfunc=lambda x: x.mean() / df['oil'].mean()),
-        num_months=pd.NamedAgg(column='period', aggfunc='count'),
-        initial_oil_date=pd.NamedAgg(column='period', aggfunc='min'),
-        average_gas_decline_rate=pd.NamedAgg(column='gas_total', aggfunc=calculate_gas_decline_rate)
-    )
+    df_ = df[['well_name', 'period', 'oil']]
+    df_ = df_[df_.oil > 0].copy()
+    if isinstance(df_['well_name'].dtype, pd.CategoricalDtype):
+        df_['well_name'] = df_['well_name'].cat.remove_unused_categories()
+    
+    df_['period'] = pd.to_datetime(df_['period'])
+    months = pd.Series(month_index(df_['period']), index=df_.index)
+    df_['months_since_first_production'] = months - months.groupby(df_['well_name'], observed=True).transform('min')
+    df_ = df_.sort_values(by=['well_name', 'period'])
+    df_['cumulative_oil_production'] = df_.groupby('well_name', observed=True)['oil'].cumsum()
+    
+    return df_
 
 def filter_and_process_data(df, well_characteristics):
     """
@@ -25,14 +73,7 @@ def filter_and_process_data(df, well_characteristics):
     """
     more_than_24 = well_characteristics[well_characteristics['num_months'] >= 24]
     well_list = more_than_24.index
-    df_ = df[df.well_name.isin(well_list)]
-    df_ = df_[['well_name', 'period', 'oil']]
-    df_ = df_[df_.oil > 0]
-    
-    df_['period'] = pd.to_datetime(df_['period'])
-    df_['months_since_first_production'] = df_.groupby('well_name')['period'].transform(lambda x: (x - x.min()) // pd.Timedelta('30D'))
-    df_ = df_.sort_values(by=['well_name', 'period'])
-    df_['cumulative_oil_production'] = df_.groupby('well_name')['oil'].cumsum()
+    df_ = process_production_rows(df[df.well_name.isin(well_list)])
     
     return df_, well_list
 
@@ -0,0 +1,85 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from ..data.make_dataset import file_fingerprint
+
+FIELD_COLUMNS = ['oil', 'gas_total', 'producing_wells']
+
+def field_totals(df):
+    """
+    Per-period field totals of a long-format frame in one grouped pass:
+    summed ``oil`` and ``gas_total`` and the number of wells with non-zero oil.
+
+    Totals of several chunks of rows can be added together. Rows are summed
+    as given: duplicate well months are not dropped here, so chunked totals
+    count a month reported in two chunks twice.
+    """
+    frame = pd.DataFrame({
+        'period': df['period'].to_numpy(),
+        'oil': df['oil'].to_numpy(dtype=float),
+        'gas_total': df['gas_total'].to_numpy(dtype=float),
+        'producing_wells': (df['oil'].fillna(0) != 0).to_numpy(dtype=np.int64),
+    })
+    return frame.groupby('period')[FIELD_COLUMNS].sum()
+
+def add_gor(totals):
+    """
+    Return field totals with a ``gor`` column: total gas over total oil per period.
+    """
+    return totals.assign(gor=totals['gas_total'] / (totals['oil'] + 1e-6))
+
+def compute_field_aggregates(df):
+    """
+    Monthly field aggregates of long-format production data.
+
+    Returns a small frame indexed by period with total ``oil`` and
+    ``gas_total``, the number of ``producing_wells`` and the field ``gor``.
+    A well month reported more than once keeps its last row, as in
+    ``flag_production_quality``.
+    """
+    return add_gor(field_totals(df.drop_duplicates(['well_name', 'period'], keep='last')))
+
+def field_aggregates_from_pivot(series):
+    """
+    The same aggregates computed from the dense ``period`` x ``well_name`` pivot.
+    """
+    oil = series['oil']
+    return add_gor(pd.DataFrame({
+        'oil': oil.sum(axis=1),
+        'gas_total': series['gas_total'].sum(axis=1),
+        'producing_wells': (oil.notna() & (oil != 0)).sum(axis=1),
+    }))
+
+def field_aggregates_cache_path(file_path):
+    return f"{file_path}.field_aggregates.pkl"
+
+def load_field_aggregates(df, file_path=None, rebuild=False):
+    """
+    Field aggregates of ``df``, cached next to the source file ``file_path``.
+
+    The cache stores the source's size, mtime and SHA-256 and is reused while
+    they match (the hash is only checked when the mtime changed). Without a
+    ``file_path`` the aggregates are simply computed.
+    """
+    if file_path is None:
+        return compute_field_aggregates(df)
+
+    cache_path = field_aggregates_cache_path(file_path)
+    if not rebuild and os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        current = file_fingerprint(file_path, with_hash=False)
+        if current['size'] == cached['source']['size'] and (
+                current['mtime'] == cached['source']['mtime']
+                or file_fingerprint(file_path)['sha256'] == cached['source']['sha256']):
+            return cached['aggregates']
+
+    aggregates = compute_field_aggregates(df)
+    tmp_path = f"{cache_path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'source': file_fingerprint(file_path), 'aggregates': aggregates}, f)
+    os.replace(tmp_path, cache_path)
+    return aggregates
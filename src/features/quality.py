@@ -0,0 +1,173 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .build_features import month_index
+
+SHUT_IN_MODES = ('mask', 'zero')
+ALIGNMENTS = ('first_production', 'last_production', 'calendar')
+
+def flag_production_quality(df, column='oil', outlier_threshold=3.5, min_ratio=2.0, neighbours=2):
+    """
+    Flag data-quality issues on every row of a long-format production frame.
+
+    Returns ``well_name``, ``period`` and ``column`` sorted by well and
+    calendar month, with:
+
+    - ``month``: the calendar month index (see ``month_index``);
+    - ``gap_months``: months missing since the well's previous row;
+    - ``duplicate``: a later row reports the same well and month (the last
+      row of a month is kept, as a restatement);
+    - ``shut_in``: ``column`` is zero, negative or missing;
+    - ``outlier``: a producing month whose log rate is more than
+      ``outlier_threshold`` robust z-scores (median absolute deviation) away
+      from the median of its ``neighbours`` producing months on either side,
+      and off that median by more than a factor of ``min_ratio`` (real
+      wells swing by tens of percent month to month, so a robust z-score
+      alone flags ordinary noise in otherwise steady wells).
+
+    Everything is computed with grouped, vectorized operations.
+    """
+    flags = df[['well_name', 'period', column]].copy()
+    flags['month'] = month_index(flags['period'])
+    flags = flags.sort_values(by=['well_name', 'month'], kind='stable')
+
+    flags['gap_months'] = (flags['month'] - flags.groupby('well_name', observed=True)['month'].shift(1) - 1) \
+        .clip(lower=0).fillna(0).astype(np.int64)
+    flags['duplicate'] = flags.duplicated(['well_name', 'month'], keep='last')
+    flags['shut_in'] = ~(flags[column] > 0)
+
+    producing = flags[~(flags['duplicate'] | flags['shut_in'])]
+    log_rate = np.log(producing[column].astype(np.float64))
+    grouped = log_rate.groupby(producing['well_name'], observed=True)
+    shifts = [k for k in range(-neighbours, neighbours + 1) if k]
+    with warnings.catch_warnings():
+        # Wells with a single producing month have no neighbours
+        warnings.simplefilter('ignore', RuntimeWarning)
+        trend = np.nanmedian(np.column_stack([grouped.shift(k).to_numpy() for k in shifts]), axis=1)
+    residual = (log_rate - trend).abs()
+    scale = residual.groupby(producing['well_name'], observed=True).transform('median')
+    score = 0.6745 * residual / scale
+    outlier = (score > outlier_threshold) & (residual > np.log(min_ratio))
+    flags['outlier'] = outlier.reindex(flags.index, fill_value=False)
+    return flags
+
+def summarize_production_quality(flags):
+    """
+    Count the issues found by ``flag_production_quality`` for each well in one grouped pass.
+    """
+    counts = pd.DataFrame({
+        'rows': 1,
+        'duplicates': flags['duplicate'],
+        'gaps': flags['gap_months'] > 0,
+        'missing_months': flags['gap_months'],
+        'shut_in_months': flags['shut_in'] & ~flags['duplicate'],
+        'outliers': flags['outlier'],
+    }, index=flags.index).astype(np.int64)
+    return counts.groupby(flags['well_name'], observed=True).sum()
+
+class MonthlyGrid:
+    """
+    Production of many wells on a calendar-month grid, as fixed-stride arrays.
+
+    ``values`` is a float32 ``[wells, months]`` array in which column ``t`` of
+    row ``i`` is month ``start[i] + t`` of well ``wells[i]``; ``observed``
+    marks the months holding a reported, unmasked rate. Each well's history
+    runs from its first to its last producing month, ``first[i]`` to
+    ``last[i]`` (column offsets); the padding outside it is NaN.
+    """
+
+    def __init__(self, wells, start, first, last, values, observed):
+        self.wells = list(wells)
+        self.start = start
+        self.first = first
+        self.last = last
+        self.values = values
+        self.observed = observed
+        self._rows = {well: i for i, well in enumerate(self.wells)}
+
+    def __len__(self):
+        return len(self.wells)
+
+    def __contains__(self, well_name):
+        return well_name in self._rows
+
+    def history(self, well_name):
+        """
+        Return a view of a well's months from first to last production.
+        """
+        i = self._rows[well_name]
+        return self.values[i, self.first[i]:self.last[i] + 1]
+
+    def histories(self):
+        """
+        Return ``{well: history}`` for every well, the input ``forecast_wells`` expects.
+        """
+        return {well: self.history(well) for well in self.wells}
+
+    def save(self, path):
+        np.savez(path, wells=np.array(self.wells, dtype=str), start=self.start, first=self.first,
+                 last=self.last, values=self.values, observed=self.observed)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['wells'].tolist(), data['start'], data['first'], data['last'],
+                       data['values'], data['observed'])
+
+def build_monthly_grid(df, column='oil', shut_in='mask', mask_outliers=False, align='first_production',
+                       flags=None, **flag_options):
+    """
+    Resample a long-format production frame onto a ``MonthlyGrid``.
+
+    Duplicate months keep their last row. Shut-in months, reported with no
+    production or missing altogether, are NaN with ``shut_in='mask'``
+    (which Chronos treats as missing) or 0 with ``shut_in='zero'``; with
+    ``mask_outliers`` flagged outliers are NaN as well. ``align`` sets
+    column 0 of each row: the well's first producing month
+    (``'first_production'``), the month that makes all histories end in the
+    last column (``'last_production'``, left-padded like ``forecast_wells``
+    batches) or the field's first producing month (``'calendar'``).
+
+    ``flags`` reuses the output of ``flag_production_quality``; otherwise it
+    is computed with ``flag_options``. Wells that never produced are left out.
+    """
+    if shut_in not in SHUT_IN_MODES:
+        raise ValueError(f"shut_in must be one of {SHUT_IN_MODES}, got '{shut_in}'")
+    if align not in ALIGNMENTS:
+        raise ValueError(f"align must be one of {ALIGNMENTS}, got '{align}'")
+    if flags is None:
+        flags = flag_production_quality(df, column=column, **flag_options)
+
+    rows = flags[~flags['duplicate']]
+    producing = rows[~rows['shut_in']]
+    span = producing.groupby('well_name', observed=True)['month'].agg(['min', 'max'])
+    wells = span.index
+    first_month = span['min'].to_numpy(dtype=np.int64)
+    last_month = span['max'].to_numpy(dtype=np.int64)
+
+    if align == 'first_production':
+        start = first_month
+    elif align == 'last_production':
+        start = last_month - (last_month - first_month).max(initial=0)
+    else:
+        start = np.full(len(wells), first_month.min() if len(wells) else 0)
+    first = first_month - start
+    last = last_month - start
+    width = int(last.max(initial=-1)) + 1
+
+    columns = np.arange(width)
+    in_span = (columns >= first[:, None]) & (columns <= last[:, None])
+    values = np.full((len(wells), width), np.nan, dtype=np.float32)
+    if shut_in == 'zero':
+        values[in_span] = 0.0
+    observed = np.zeros((len(wells), width), dtype=bool)
+
+    codes = pd.Categorical(producing['well_name'], categories=wells).codes
+    offsets = producing['month'].to_numpy() - start[codes]
+    keep = ~producing['outlier'].to_numpy() if mask_outliers else np.ones(len(producing), dtype=bool)
+    values[codes, offsets] = np.where(keep, producing[column].to_numpy(), np.nan)
+    observed[codes[keep], offsets[keep]] = True
+    return MonthlyGrid(wells, start, first, last, values, observed)
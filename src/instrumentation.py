@@ -0,0 +1,208 @@
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+_ACTIVE_REPORT = None
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process in MB, or None if unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def current_rss_mb():
+    """
+    Return the current resident set size of this process in MB, or None if unavailable.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def _summarize_latencies(latencies):
+    ordered = sorted(latencies)
+    return {
+        'calls': len(ordered),
+        'total_s': sum(ordered),
+        'mean_s': sum(ordered) / len(ordered),
+        'p50_s': ordered[len(ordered) // 2],
+        'p95_s': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        'max_s': ordered[-1],
+    }
+
+class RunReport:
+    """
+    Timings, memory and model-call statistics for one pipeline run.
+
+    Wrap each step in ``with report.stage(name):`` to record its wall and
+    CPU time and its RSS before and after (and, with ``trace_memory``, the
+    tracemalloc allocation delta and peak). With ``profile`` set to
+    ``'cprofile'`` or ``'pyinstrument'`` each stage is also profiled and
+    dumped to ``profile_dir``. Code deeper in the pipeline records into the
+    active report through the module-level ``record_*`` functions, which do
+    nothing when no report is active. ``write`` saves everything as JSON.
+    """
+
+    def __init__(self, trace_memory=False, profile=None, profile_dir=None):
+        if profile not in (None, 'cprofile', 'pyinstrument'):
+            raise ValueError(f"Unknown profiler '{profile}'")
+        self.trace_memory = trace_memory
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.started = datetime.now(timezone.utc).isoformat()
+        self.stages = []
+        self.timings = {}
+        self.model_calls = {}
+        self.metrics = {}
+
+    def __enter__(self):
+        global _ACTIVE_REPORT
+        self._previous = _ACTIVE_REPORT
+        _ACTIVE_REPORT = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE_REPORT
+        _ACTIVE_REPORT = self._previous
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def add_stage(self, name, wall_s, **extra):
+        """
+        Record a stage timed elsewhere, such as interpreter startup.
+        """
+        self.stages.append({'name': name, 'wall_s': wall_s, **extra})
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time, measure and optionally profile the enclosed block as one stage.
+        """
+        profiler = self._start_profiler()
+        record = {'name': name, 'rss_start_mb': current_rss_mb()}
+        # tracemalloc.reset_peak is Python 3.9+; without it the peak spans the whole trace and is not recorded
+        peak_resettable = hasattr(tracemalloc, 'reset_peak')
+        if self.trace_memory and tracemalloc.is_tracing():
+            if peak_resettable:
+                tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        print(f"[{name}] started")
+        try:
+            yield record
+        finally:
+            record['wall_s'] = time.perf_counter() - wall_start
+            record['cpu_s'] = time.process_time() - cpu_start
+            record['rss_end_mb'] = current_rss_mb()
+            record['peak_rss_mb'] = peak_rss_mb()
+            if self.trace_memory and tracemalloc.is_tracing():
+                traced_end, traced_peak = tracemalloc.get_traced_memory()
+                record['tracemalloc_delta_mb'] = (traced_end - traced_start) / 1e6
+                if peak_resettable:
+                    record['tracemalloc_peak_mb'] = (traced_peak - traced_start) / 1e6
+            if profiler is not None:
+                record['profile'] = self._stop_profiler(profiler, name)
+            self.stages.append(record)
+            print(f"[{name}] finished in {record['wall_s']:.2f}s")
+
+    def _start_profiler(self):
+        if self.profile == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.profile == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_profiler(self, profiler, name):
+        os.makedirs(self.profile_dir or '.', exist_ok=True)
+        stem = os.path.join(self.profile_dir or '.', name.replace(' ', '_'))
+        if self.profile == 'cprofile':
+            profiler.disable()
+            path = f'{stem}.prof'
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = f'{stem}.html'
+            with open(path, 'w') as f:
+                f.write(profiler.output_html())
+        return path
+
+    def add_timing(self, section, key, seconds, **extra):
+        """
+        Add ``seconds`` (and any counts in ``extra``) to ``timings[section][key]``.
+        """
+        entry = self.timings.setdefault(section, {}).setdefault(key, {'seconds': 0.0})
+        entry['seconds'] += seconds
+        for name, value in extra.items():
+            entry[name] = entry.get(name, 0) + value
+
+    def add_model_call(self, model, seconds, batch_size):
+        calls = self.model_calls.setdefault(model, {'latencies': [], 'series': 0})
+        calls['latencies'].append(seconds)
+        calls['series'] += batch_size
+
+    def as_dict(self):
+        return {
+            'started': self.started,
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'pid': os.getpid(),
+            'peak_rss_mb': peak_rss_mb(),
+            'total_wall_s': sum(stage['wall_s'] for stage in self.stages),
+            'stages': self.stages,
+            'timings': {section: {key: {**entry, 'seconds_per_well': entry['seconds'] / entry['wells']}
+                                  if entry.get('wells') else entry for key, entry in entries.items()}
+                        for section, entries in self.timings.items()},
+            'model_calls': {model: {**_summarize_latencies(calls['latencies']), 'series': calls['series']}
+                            for model, calls in self.model_calls.items()},
+            'metrics': self.metrics,
+        }
+
+    def write(self, path):
+        """
+        Write the report as JSON and return its path.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=1, default=str)
+        return path
+
+def active_report():
+    """
+    Return the report of the current run, or None outside of one.
+    """
+    return _ACTIVE_REPORT
+
+def record_timing(section, key, seconds, **extra):
+    if _ACTIVE_REPORT is not None:
+        _ACTIVE_REPORT.add_timing(section, key, seconds, **extra)
+
+def record_model_call(model, seconds, batch_size):
+    if _ACTIVE_REPORT is not None:
+        _ACTIVE_REPORT.add_model_call(model, seconds, batch_size)
+
+def record_metric(name, value):
+    if _ACTIVE_REPORT is not None:
+        _ACTIVE_REPORT.metrics[name] = value
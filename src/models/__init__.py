@@ -1,2 +1,21 @@
-from .train_model import train_and_evaluate_models, load_chronos_pipeline
-from .predict_model import predict_oil_production
\ No newline at end of file
+from .._lazy import lazy_exports
+
+__all__ = ['train_and_evaluate_models', 'load_chronos_pipeline', 'predict_oil_production',
+           'predict_oil_production_for_wells', 'forecast_wells', 'get_pipeline', 'init_worker', 'register_loader',
+           'rolling_origin_backtest', 'fit_decline_curves', 'ForecastService', 'ForecastServer', 'QuantileForecasts']
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    'train_and_evaluate_models': '.train_model',
+    'load_chronos_pipeline': '.train_model',
+    'predict_oil_production': '.predict_model',
+    'predict_oil_production_for_wells': '.predict_model',
+    'forecast_wells': '.predict_model',
+    'get_pipeline': '.registry',
+    'init_worker': '.registry',
+    'register_loader': '.registry',
+    'rolling_origin_backtest': '.backtest',
+    'fit_decline_curves': '.decline_curve',
+    'ForecastService': '.serving',
+    'ForecastServer': '.serving',
+    'QuantileForecasts': '.forecast_store',
+})
@@ -0,0 +1,112 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .batch_regression import POLYNOMIAL_MODELS, fit_polynomial_batch, masked_rmse
+from .decline_curve import ARPS_MODELS, arps_rate, fit_arps_batch
+from .predict_model import forecast_wells
+from .registry import get_pipeline, init_worker
+from ..data.make_dataset import WellStore
+
+DEFAULT_MODELS = tuple(POLYNOMIAL_MODELS) + tuple(ARPS_MODELS) + ('Chronos',)
+
+def rolling_origin_windows(values, window, horizon, stride=1):
+    """
+    Return a strided view of shape ``[n_origins, window + horizon]`` over a 1-D array.
+
+    Row ``i`` holds the training window followed by the test horizon for the
+    ``i``-th forecast origin; origins are ``stride`` points apart and the
+    last one ends at the final point. No data is copied.
+    """
+    values = np.asarray(values)
+    if len(values) < window + horizon:
+        return np.empty((0, window + horizon), dtype=values.dtype)
+    views = sliding_window_view(values, window + horizon)
+    return views[(len(views) - 1) % stride::stride]
+
+def _backtest_chunk(wells, window, horizon, stride, models, pipeline_name, batch_size, num_samples):
+    """
+    Backtest one chunk of wells, batching every model call across wells and origins.
+
+    ``wells`` maps well name to ``(months, oil, periods)`` arrays.
+    """
+    x_views, y_views, index = [], [], []
+    for well, (months, oil, periods) in wells.items():
+        x = rolling_origin_windows(months, window, horizon, stride)
+        if not len(x):
+            continue
+        x_views.append(x)
+        y_views.append(rolling_origin_windows(oil, window, horizon, stride))
+        origins = rolling_origin_windows(periods, window, horizon, stride)[:, window]
+        index.extend((well, origin) for origin in origins)
+    if not index:
+        return pd.DataFrame(columns=['rmse'], index=pd.MultiIndex.from_tuples([], names=['well', 'origin', 'model']))
+
+    # The batched float arrays are the chunk's only copy of the windows
+    x = np.concatenate(x_views, dtype=float)
+    y = np.concatenate(y_views, dtype=float)
+    x_train, x_test = x[:, :window], x[:, window:]
+    y_train, y_test = y[:, :window], y[:, window:]
+    train_mask = np.ones(x_train.shape, dtype=bool)
+    test_mask = np.ones(x_test.shape, dtype=bool)
+
+    rmse = {}
+    for model_name in models:
+        if model_name in POLYNOMIAL_MODELS:
+            y_pred = fit_polynomial_batch(x_train, y_train, train_mask, x_test, POLYNOMIAL_MODELS[model_name])
+        elif model_name in ARPS_MODELS:
+            origin = x_train[:, :1]
+            fit = fit_arps_batch(x_train - origin, y_train, train_mask, ARPS_MODELS[model_name])
+            y_pred = arps_rate(x_test - origin, fit['qi'][:, None], fit['di'][:, None], fit['b'][:, None])
+        elif model_name == 'Chronos':
+            contexts = dict(enumerate(y_train))
+            forecasts = forecast_wells(get_pipeline(pipeline_name), contexts, horizon, batch_size=batch_size,
+                                       num_samples=num_samples, quantile_levels=(0.5,))
+            y_pred = np.stack([forecasts[i][0] for i in range(len(y_train))])
+        else:
+            raise ValueError(f"Unknown model '{model_name}'")
+        rmse[model_name] = masked_rmse(y_test, y_pred, test_mask)
+
+    frame = pd.DataFrame(rmse, index=pd.MultiIndex.from_tuples(index, names=['well', 'origin'])).reset_index()
+    frame = frame.melt(id_vars=['well', 'origin'], var_name='model', value_name='rmse')
+    return frame.set_index(['well', 'origin', 'model']).sort_index()
+
+def rolling_origin_backtest(df, well_list, window=24, horizon=12, stride=1, models=DEFAULT_MODELS,
+                            n_jobs=1, pipeline_name='chronos', batch_size=64, num_samples=1, chunk_wells=256):
+    """
+    Evaluate models at many forecast origins per well.
+
+    For each well every origin with ``window`` months of training data and
+    ``horizon`` months of test data is used, ``stride`` months apart. The
+    windows are strided views over the well's arrays, copied once per chunk
+    of ``chunk_wells`` wells into the batched arrays that each model is
+    called on for all of their origins; the chunk size bounds that memory. With ``n_jobs > 1``
+    the chunks are evaluated in worker processes, each loading the Chronos
+    pipeline once. Chronos forecasts the median of ``num_samples`` sample
+    paths; more samples give a less noisy point forecast at proportionally
+    more inference.
+
+    Returns a tidy frame with an ``rmse`` column indexed by (well, origin,
+    model), where origin is the period of the first forecast month.
+    """
+    store = df if isinstance(df, WellStore) else WellStore.from_frame(df)
+    wells = {
+        well: (store.get(well, 'months_since_first_production'), store.get(well, 'oil'), store.get(well, 'period'))
+        for well in well_list if well in store
+    }
+    args = (window, horizon, stride, tuple(models), pipeline_name, batch_size, num_samples)
+
+    names = list(wells)
+    chunks = [{well: wells[well] for well in names[i:i + chunk_wells]} for i in range(0, len(names), chunk_wells)]
+    if not chunks:
+        return _backtest_chunk({}, *args)
+
+    if n_jobs <= 1:
+        frames = [_backtest_chunk(chunk, *args) for chunk in chunks]
+    else:
+        initializer = init_worker if 'Chronos' in models else None
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=initializer, initargs=(pipeline_name,)) as executor:
+            frames = list(executor.map(_backtest_chunk, chunks, *[[arg] * len(chunks) for arg in args]))
+    return pd.concat(frames).sort_index()
@@ -0,0 +1,67 @@
+import numpy as np
+
+POLYNOMIAL_MODELS = {'Linear': 1, 'Polynomial (Degree 2)': 2, 'Polynomial (Degree 3)': 3}
+
+def pad_windows(windows):
+    """
+    Stack 1-D arrays of different lengths into a zero-padded ``[n, length]`` array and a validity mask.
+    """
+    length = max((len(w) for w in windows), default=0)
+    values = np.zeros((len(windows), length))
+    mask = np.zeros((len(windows), length), dtype=bool)
+    for i, w in enumerate(windows):
+        values[i, :len(w)] = np.ravel(w)
+        mask[i, :len(w)] = True
+    return values, mask
+
+def fit_polynomial_batch(x_train, y_train, train_mask, x_test, degree):
+    """
+    Fit ``y ~ poly(x, degree)`` with an intercept for every row at once and predict ``x_test``.
+
+    Inputs are ``[n, length]`` arrays; padded training points are excluded
+    through ``train_mask``. Like sklearn's ``LinearRegression`` the features
+    and target are centered on the training mean and the least-squares problem
+    is solved with a (batched) pseudo-inverse, so rank-deficient windows get
+    the same minimum-norm solution. Rows without training points predict NaN.
+    """
+    powers = np.arange(1, degree + 1)
+    weights = train_mask.astype(float)
+    counts = weights.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        features = x_train[..., None] ** powers
+        feature_mean = (features * weights[..., None]).sum(axis=1) / counts[:, None]
+        target_mean = (y_train * weights).sum(axis=1) / counts
+    centered = np.nan_to_num((features - feature_mean[:, None, :]) * weights[..., None])
+    target = np.nan_to_num((y_train - target_mean[:, None]) * weights)
+    coef = np.linalg.pinv(centered) @ target[..., None]
+
+    test_features = x_test[..., None] ** powers
+    return ((test_features - feature_mean[:, None, :]) @ coef)[..., 0] + target_mean[:, None]
+
+def masked_rmse(y_true, y_pred, mask):
+    """
+    Root mean squared error per row over the valid (masked-in) points.
+    """
+    squared = np.where(mask, (y_true - y_pred) ** 2, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sqrt(squared.sum(axis=1) / mask.sum(axis=1))
+
+def evaluate_polynomial_batch(splits, degrees):
+    """
+    Evaluate polynomial fits of several degrees for many wells in one vectorized pass.
+
+    ``splits`` maps well name to ``(X_train, X_test, y_train, y_test)`` as
+    returned by ``split_train_test`` and ``degrees`` maps model name to
+    degree. Returns ``{model_name: {well: rmse}}``.
+    """
+    wells = list(splits)
+    x_train, train_mask = pad_windows([splits[well][0] for well in wells])
+    x_test, test_mask = pad_windows([splits[well][1] for well in wells])
+    y_train, _ = pad_windows([splits[well][2] for well in wells])
+    y_test, _ = pad_windows([splits[well][3] for well in wells])
+
+    results = {}
+    for model_name, degree in degrees.items():
+        y_pred = fit_polynomial_batch(x_train, y_train, train_mask, x_test, degree)
+        results[model_name] = dict(zip(wells, masked_rmse(y_test, y_pred, test_mask)))
+    return results
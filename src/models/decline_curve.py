@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+from .batch_regression import pad_windows, masked_rmse
+from ..data.make_dataset import WellStore
+
+ARPS_MODELS = {'Arps (Exponential)': 'exponential', 'Arps (Hyperbolic)': 'hyperbolic', 'Arps (Harmonic)': 'harmonic'}
+
+_B_BOUNDS = (0.01, 2.0)
+_LOG_DI_BOUNDS = (np.log(1e-6), np.log(10.0))
+
+def arps_rate(t, qi, di, b):
+    """
+    Arps decline rate ``qi / (1 + b * di * t) ** (1 / b)``, exponential where ``b == 0``.
+    """
+    t, qi, di, b = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (t, qi, di, b)))
+    exponential = qi * np.exp(-di * t)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        hyperbolic = qi * (1 + b * di * t) ** (-1 / b)
+    return np.where(b == 0, exponential, hyperbolic)
+
+def arps_cumulative(t, qi, di, b):
+    """
+    Cumulative production from time 0 to ``t`` under an Arps decline.
+    """
+    t, qi, di, b = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (t, qi, di, b)))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        exponential = qi / di * (1 - np.exp(-di * t))
+        harmonic = qi / di * np.log1p(di * t)
+        hyperbolic = qi / ((1 - b) * di) * (1 - (1 + b * di * t) ** (1 - 1 / b))
+    return np.where(b == 0, exponential, np.where(np.isclose(b, 1.0), harmonic, hyperbolic))
+
+def _model_and_jacobian(t, params, kind):
+    """
+    Rates and their derivatives with respect to ``(log qi, log di, b)``.
+    """
+    qi = np.exp(params[:, 0:1])
+    di = np.exp(params[:, 1:2])
+    b = params[:, 2:3]
+    if kind == 'exponential':
+        q = qi * np.exp(-di * t)
+        jacobian = np.stack([q, -q * di * t, np.zeros_like(q)], axis=-1)
+        return q, jacobian
+    growth = 1 + b * di * t
+    q = qi * growth ** (-1 / b)
+    d_log_di = -q * di * t / growth
+    d_b = q * (np.log(growth) / b ** 2 - di * t / (b * growth))
+    return q, np.stack([q, d_log_di, d_b], axis=-1)
+
+def fit_arps_batch(t, q, mask, kind='hyperbolic', max_iter=50):
+    """
+    Fit an Arps decline to every row of ``[n, length]`` arrays at once.
+
+    Uses batched Levenberg-Marquardt on ``(log qi, log di, b)``, each row
+    with its own damping, starting from a log-linear exponential fit. ``b``
+    is fixed at 0 for ``exponential``, at 1 for ``harmonic`` and bounded to
+    [0.01, 2] for ``hyperbolic``. Residuals are scaled by each row's mean
+    rate so wells of any size converge alike. Returns a dict of ``qi``,
+    ``di`` and ``b`` arrays; rows without points get NaN.
+    """
+    t = np.where(mask, t, 0.0)
+    weights = mask.astype(float)
+    counts = weights.sum(axis=1)
+    scale = np.where(counts > 0, (q * weights).sum(axis=1) / np.maximum(counts, 1), 1.0)[:, None]
+    scale = np.where(scale > 0, scale, 1.0)
+    target = np.where(mask, q / scale, 0.0)
+
+    # Log-linear exponential fit as the starting point
+    log_q = np.where(mask & (target > 0), np.log(np.where(target > 0, target, 1.0)), 0.0)
+    t_mean = (t * weights).sum(axis=1) / np.maximum(counts, 1)
+    log_mean = (log_q * weights).sum(axis=1) / np.maximum(counts, 1)
+    t_centered = (t - t_mean[:, None]) * weights
+    variance = (t_centered ** 2).sum(axis=1)
+    slope = np.where(variance > 0, (t_centered * (log_q - log_mean[:, None])).sum(axis=1) / np.where(variance > 0, variance, 1), 0.0)
+    params = np.column_stack([
+        log_mean - slope * t_mean,
+        np.clip(np.log(np.maximum(-slope, 1e-4)), *_LOG_DI_BOUNDS),
+        np.full(len(t), {'exponential': 0.0, 'harmonic': 1.0}.get(kind, 0.5)),
+    ])
+    free = [0, 1] if kind in ('exponential', 'harmonic') else [0, 1, 2]
+
+    def cost(p):
+        predicted, _ = _model_and_jacobian(t, p, kind)
+        return (np.where(mask, predicted - target, 0.0) ** 2).sum(axis=1)
+
+    damping = np.full(len(t), 1e-3)
+    current = cost(params)
+    for _ in range(max_iter):
+        predicted, jacobian = _model_and_jacobian(t, params, kind)
+        residual = np.where(mask, predicted - target, 0.0)
+        jacobian = (jacobian * weights[..., None])[..., free]
+        normal = jacobian.transpose(0, 2, 1) @ jacobian
+        gradient = jacobian.transpose(0, 2, 1) @ residual[..., None]
+        diagonal = np.diagonal(normal, axis1=1, axis2=2)
+        damped = normal + damping[:, None, None] * (np.eye(len(free)) * np.maximum(diagonal, 1e-12)[:, None, :])
+        step = np.linalg.solve(damped + 1e-12 * np.eye(len(free)), -gradient)[..., 0]
+
+        candidate = params.copy()
+        candidate[:, free] += step
+        candidate[:, 1] = np.clip(candidate[:, 1], *_LOG_DI_BOUNDS)
+        if kind == 'hyperbolic':
+            candidate[:, 2] = np.clip(candidate[:, 2], *_B_BOUNDS)
+        with np.errstate(over='ignore', invalid='ignore'):
+            trial = cost(candidate)
+        improved = np.isfinite(trial) & (trial < current)
+        params = np.where(improved[:, None], candidate, params)
+        current = np.where(improved, trial, current)
+        damping = np.clip(np.where(improved, damping / 3, damping * 3), 1e-9, 1e9)
+
+    empty = counts == 0
+    qi = np.where(empty, np.nan, np.exp(params[:, 0]) * scale[:, 0])
+    di = np.where(empty, np.nan, np.exp(params[:, 1]))
+    b = np.where(empty, np.nan, params[:, 2])
+    return {'qi': qi, 'di': di, 'b': b}
+
+def evaluate_arps_batch(splits, kinds):
+    """
+    Evaluate Arps declines for many wells in one vectorized pass.
+
+    Same interface as ``evaluate_polynomial_batch``: ``splits`` maps well
+    name to ``(X_train, X_test, y_train, y_test)`` and ``kinds`` maps model
+    name to Arps kind. Time is measured from the start of each training
+    window. Returns ``{model_name: {well: rmse}}``.
+    """
+    wells = list(splits)
+    x_train, train_mask = pad_windows([splits[well][0] for well in wells])
+    x_test, test_mask = pad_windows([splits[well][1] for well in wells])
+    y_train, _ = pad_windows([splits[well][2] for well in wells])
+    y_test, _ = pad_windows([splits[well][3] for well in wells])
+    origin = x_train[:, :1]
+
+    results = {}
+    for model_name, kind in kinds.items():
+        fit = fit_arps_batch(x_train - origin, y_train, train_mask, kind)
+        y_pred = arps_rate(x_test - origin, fit['qi'][:, None], fit['di'][:, None], fit['b'][:, None])
+        results[model_name] = dict(zip(wells, masked_rmse(y_test, y_pred, test_mask)))
+    return results
+
+def estimate_eur(qi, di, b, t_now, cumulative_to_date, economic_limit=1.0, max_months=600):
+    """
+    Estimated ultimate recovery: production to date plus the Arps forecast
+    from ``t_now`` until the rate falls to ``economic_limit`` or ``max_months``.
+    """
+    qi, di, b, t_now = (np.asarray(v, dtype=float) for v in (qi, di, b, t_now))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.maximum(qi / economic_limit, 1.0)
+        t_limit = np.where(b == 0, np.log(ratio) / di, (ratio ** b - 1) / (b * di))
+    t_end = np.clip(t_limit, t_now, max_months)
+    remaining = arps_cumulative(t_end, qi, di, b) - arps_cumulative(t_now, qi, di, b)
+    return cumulative_to_date + np.maximum(np.nan_to_num(remaining), 0.0)
+
+def fit_decline_curves(df, well_list, kind='hyperbolic', economic_limit=1.0, max_months=600):
+    """
+    Fit an Arps decline to each well's full producing history.
+
+    ``df`` is the output of ``filter_and_process_data`` (or a ``WellStore``
+    of it); time is ``months_since_first_production``, so ``qi`` is the rate
+    at first production and ``di`` is per month. EUR adds the remaining
+    forecast to the well's last ``cumulative_oil_production``. Returns a
+    frame indexed by well with ``qi``, ``di``, ``b`` and ``eur``.
+    """
+    store = df if isinstance(df, WellStore) else WellStore.from_frame(df)
+    wells = [well for well in well_list if well in store]
+    t, mask = pad_windows([store.get(well, 'months_since_first_production') for well in wells])
+    q, _ = pad_windows([store.get(well, 'oil') for well in wells])
+    fit = fit_arps_batch(t, q, mask, kind)
+
+    t_now = np.array([store.get(well, 'months_since_first_production')[-1] for well in wells], dtype=float)
+    cumulative = np.array([store.get(well, 'cumulative_oil_production')[-1] for well in wells], dtype=float)
+    eur = estimate_eur(fit['qi'], fit['di'], fit['b'], t_now, cumulative, economic_limit, max_months)
+    return pd.DataFrame({'qi': fit['qi'], 'di': fit['di'], 'b': fit['b'], 'eur': eur},
+                        index=pd.Index(wells, name='well_name'))
@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+class QuantileForecasts:
+    """
+    Quantile forecasts of many wells as one float32 ``[well, quantile, horizon]`` array.
+
+    Saved as a directory holding ``values.npy`` (memory-mapped on load),
+    the well names and a JSON ``meta.json`` with the quantile levels and any
+    run metadata (pipeline, num_samples, ...), so reports and plots can be
+    rebuilt from disk without rerunning inference. A well's forecast is a
+    tuple of views, one per quantile level, as ``forecast_wells`` returns.
+    """
+
+    def __init__(self, wells, quantile_levels, values, meta=None):
+        self.wells = [str(well) for well in wells]
+        self.quantile_levels = tuple(float(level) for level in quantile_levels)
+        self.values = values
+        self.meta = dict(meta or {})
+        self._rows = {well: i for i, well in enumerate(self.wells)}
+
+    @classmethod
+    def from_dict(cls, forecasts, quantile_levels, meta=None):
+        """
+        Build from ``forecast_wells`` output: ``{well: (quantile arrays)}``.
+        """
+        wells = list(forecasts)
+        horizon = max((len(forecasts[well][0]) for well in wells), default=0)
+        values = np.full((len(wells), len(quantile_levels), horizon), np.nan, dtype=np.float32)
+        for i, well in enumerate(wells):
+            for j, quantile in enumerate(forecasts[well]):
+                values[i, j, :len(quantile)] = quantile
+        return cls(wells, quantile_levels, values, meta)
+
+    def __len__(self):
+        return len(self.wells)
+
+    def __contains__(self, well_name):
+        return well_name in self._rows
+
+    def __getitem__(self, well_name):
+        return tuple(self.values[self._rows[well_name]])
+
+    def quantile(self, level):
+        """
+        Return a ``[well, horizon]`` view of one quantile level.
+        """
+        return self.values[:, self.quantile_levels.index(level)]
+
+    def to_frame(self):
+        """
+        Long frame with one row per well and horizon step and one column per quantile level.
+        """
+        n_wells, _, horizon = self.values.shape
+        frame = pd.DataFrame({
+            'well_name': np.repeat(self.wells, horizon),
+            'horizon': np.tile(np.arange(1, horizon + 1), n_wells),
+        })
+        for j, level in enumerate(self.quantile_levels):
+            frame[f'q{level:g}'] = self.values[:, j].reshape(-1)
+        return frame
+
+    def save(self, path):
+        """
+        Write the forecasts to a directory, replacing it atomically.
+        """
+        tmp_dir = f"{path}.tmp{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        np.save(os.path.join(tmp_dir, 'values.npy'), np.ascontiguousarray(self.values, dtype=np.float32))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump({'wells': self.wells, 'quantile_levels': self.quantile_levels, 'meta': self.meta}, f)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp_dir, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r' if mmap else None)
+        return cls(meta['wells'], meta['quantile_levels'], values, meta['meta'])
@@ -1,37 +1,103 @@
 import torch
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import time
+from ..data.make_dataset import WellStore
+from ..instrumentation import record_model_call
+from ..visualization.visualize import plot_forecasts
 
-def predict_oil_production(well_name, df, pipeline, output_dir):
+def _left_pad_batch(contexts):
     """
-    Predict oil production for a specific well using the Chronos pipeline and save the plot.
+    Left-pad a list of 1-D arrays with NaN into one ``[batch, length]`` tensor.
+    """
+    length = max(len(c) for c in contexts)
+    batch = np.full((len(contexts), length), np.nan, dtype=np.float32)
+    for i, c in enumerate(contexts):
+        if len(c):
+            batch[i, length - len(c):] = c
+    return torch.from_numpy(batch)
+
+def forecast_wells(pipeline, contexts, prediction_length, batch_size=32, num_samples=24,
+                   temperature=1.0, top_k=50, top_p=1.0, quantile_levels=(0.1, 0.5, 0.9), max_batch_values=1 << 22):
+    """
+    Forecast many wells with one ``pipeline.predict`` call per batch.
+
+    ``contexts`` maps well name to its 1-D history. Wells are grouped by
+    history length to keep padding small, and each batch is left-padded with
+    NaN, which Chronos treats as missing. ``pipeline`` can be any object with
+    the ``ChronosPipeline.predict`` signature; each call's latency is recorded
+    in the active run report.
+
+    Each batch's ``[batch, num_samples, prediction_length]`` samples are
+    reduced to ``quantile_levels`` before the next batch is drawn, and the
+    batch is shrunk so that it holds at most ``max_batch_values`` sample
+    values; memory therefore does not grow with the number of wells, and
+    more samples mean smaller batches rather than larger tensors. The
+    quantiles of all wells share one float32 ``[wells, quantiles, horizon]``
+    array. Returns a dict mapping well name to a tuple of quantile arrays
+    (low, median, high by default).
+    """
+    wells = sorted(contexts, key=lambda well: len(contexts[well]))
+    batch_size = max(1, min(batch_size, max_batch_values // max(1, num_samples * prediction_length)))
+    values = np.empty((len(wells), len(quantile_levels), prediction_length), dtype=np.float32)
+    for start in range(0, len(wells), batch_size):
+        batch_wells = wells[start:start + batch_size]
+        context = _left_pad_batch([np.asarray(contexts[well], dtype=np.float32) for well in batch_wells])
+        call_start = time.perf_counter()
+        samples = pipeline.predict(context, prediction_length, num_samples=num_samples,
+                                   temperature=temperature, top_k=top_k, top_p=top_p)
+        record_model_call(type(pipeline).__name__, time.perf_counter() - call_start, len(batch_wells))
+        values[start:start + len(batch_wells)] = np.quantile(samples.numpy(), quantile_levels, axis=1).transpose(1, 0, 2)
+        del samples
+    return {well: tuple(values[i]) for i, well in enumerate(wells)}
+
+def prediction_interval(quantile_levels, quantiles):
+    """
+    Pick ``(low, median, high)`` from a forecast's quantiles: the outermost
+    levels and the median (or the middle level).
+    """
+    levels = list(quantile_levels)
+    middle = levels.index(0.5) if 0.5 in levels else len(levels) // 2
+    return quantiles[0], quantiles[middle], quantiles[-1]
+
+def interval_label(quantile_levels):
+    return f"{(max(quantile_levels) - min(quantile_levels)) * 100:.0f}% prediction interval"
+
+def predict_oil_production_for_wells(well_names, df, pipeline, output_dir, prediction_length=6, batch_size=32,
+                                     n_jobs=1, num_samples=24, quantile_levels=(0.1, 0.5, 0.9), force=False):
+    """
+    Predict oil production for several wells with batched Chronos calls and save one plot per well.
+
+    ``df`` may be a long-format DataFrame or a ``WellStore``. ``num_samples``
+    sample paths are drawn per well and reduced to ``quantile_levels``
+    (sorted); the plots show the outermost levels as the interval. The plots
+    are rendered in ``n_jobs`` processes; ``force`` re-renders unchanged
+    ones. Returns a dict mapping well name to its tuple of quantile arrays.
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    df_well = df[df['well_name'] == well_name]
-    df_well = df_well[df_well.oil > 0].reset_index(drop=True)
-    
-    context = torch.tensor(df_well["oil"].values, dtype=torch.float32)
-    prediction_length = 6
-    forecast = pipeline.predict(context, prediction_length, num_samples=24, temperature=1.0, top_k=50, top_p=1.0)
-    
-    forecast_index = range(len(df_well), len(df_well) + prediction_length)
-    low, median, high = np.quantile(forecast[0].numpy(), [0.1, 0.5, 0.9], axis=0)
-    
-    plt.figure(figsize=(10, 6))
-    plt.plot(df_well.index, df_well["oil"], color="royalblue", label="Historical data")
-    plt.plot(forecast_index, median, color="tomato", label="Median forecast")
-    plt.fill_between(forecast_index, low, high, color="tomato", alpha=0.3, label="80% prediction interval")
-    plt.legend()
-    plt.grid(True)
-    plt.title(f"Oil Production Forecast for {well_name}")
-    plt.xlabel("Time")
-    plt.ylabel("Oil Production")
-    plt.savefig(os.path.join(output_dir, f'forecast_{well_name}.png'))
-    plt.close()
-
-    print(f"Forecast for {well_name}:")
-    print(f"Median forecast: {median}")
-    print(f"80% prediction interval: [{low}, {high}]")
\ No newline at end of file
+    quantile_levels = tuple(sorted(quantile_levels))
+    store = df if isinstance(df, WellStore) else WellStore.from_frame(df[['well_name', 'oil']])
+    histories = {}
+    for well_name in well_names:
+        oil = store.get(well_name, 'oil') if well_name in store else np.array([])
+        histories[well_name] = oil[oil > 0]
+
+    forecasts = forecast_wells(pipeline, histories, prediction_length, batch_size=batch_size,
+                               num_samples=num_samples, quantile_levels=quantile_levels)
+    label = interval_label(quantile_levels)
+    intervals = {}
+    for well_name in well_names:
+        low, median, high = intervals[well_name] = prediction_interval(quantile_levels, forecasts[well_name])
+        print(f"Forecast for {well_name}:")
+        print(f"Median forecast: {median}")
+        print(f"{label}: [{low}, {high}]")
+    plot_forecasts(histories, intervals, output_dir, n_jobs=n_jobs, interval_label=label, force=force)
+    return {well_name: forecasts[well_name] for well_name in well_names}
+
+def predict_oil_production(well_name, df, pipeline, output_dir):
+    """
+    Predict oil production for a specific well using the Chronos pipeline and save the plot.
+    """
+    return predict_oil_production_for_wells([well_name], df, pipeline, output_dir)[well_name]
@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+from ..instrumentation import peak_rss_mb, record_timing
+
+_LOADERS = {}
+_PIPELINES = {}
+_LOAD_LOCK = threading.Lock()
+
+def register_loader(name, loader):
+    """
+    Register a zero-argument loader for a named pipeline.
+    """
+    _LOADERS[name] = loader
+
+def _default_loader(name):
+    if name == 'chronos':
+        from .train_model import load_chronos_pipeline
+        return load_chronos_pipeline
+    if name == 'stub':
+        from .stub_pipeline import StubChronosPipeline
+        return StubChronosPipeline
+    raise KeyError(f"No loader registered for pipeline '{name}'")
+
+def get_pipeline(name='chronos'):
+    """
+    Return the named pipeline, loading it on first use in this process.
+
+    Every caller in the process shares the same instance, so the weights are
+    loaded once per process instead of once per call or per pickled task.
+    Loading is serialized with a lock, so stages running in parallel
+    threads wait for one load instead of each loading the weights.
+    """
+    if name not in _PIPELINES:
+        with _LOAD_LOCK:
+            if name not in _PIPELINES:
+                loader = _LOADERS.get(name) or _default_loader(name)
+                start = time.perf_counter()
+                _PIPELINES[name] = loader()
+                elapsed = time.perf_counter() - start
+                record_timing('pipeline_load', name, elapsed)
+                rss = peak_rss_mb()
+                rss_text = f"{rss:.0f} MB" if rss is not None else "unknown"
+                print(f"Loaded '{name}' pipeline in {elapsed:.2f}s (pid {os.getpid()}, peak RSS {rss_text})")
+    return _PIPELINES[name]
+
+def init_worker(*names):
+    """
+    Process-pool initializer that loads the named pipelines once per worker.
+
+    Use as ``ProcessPoolExecutor(initializer=init_worker, initargs=('chronos',))``
+    so tasks only carry well data and look the model up with ``get_pipeline``.
+    """
+    for name in names or ('chronos',):
+        get_pipeline(name)
+
+def clear_pipelines():
+    """
+    Drop all loaded pipelines from this process.
+    """
+    _PIPELINES.clear()
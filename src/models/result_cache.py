@@ -0,0 +1,67 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+
+def make_key(signature, *arrays):
+    """
+    Hash a model signature together with the contents of the given arrays.
+    """
+    digest = hashlib.sha256(signature.encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    Content-addressed cache of per-(well, model) results with LRU eviction.
+
+    Entries are keyed by ``make_key`` over a well's training and test arrays
+    and the model signature, so a result is reused exactly when the data and
+    configuration it was computed from are unchanged. At most ``max_entries``
+    are kept; the least recently used are evicted first. The cache lives in
+    memory during a run and is persisted to ``path`` by ``save``.
+    """
+
+    def __init__(self, path, max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.entries = pickle.load(f)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Return the cached value for ``key``, or None, and count the hit or miss.
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self):
+        return f"{self.hits} hits, {self.misses} misses, {len(self.entries)} entries"
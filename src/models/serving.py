@@ -0,0 +1,317 @@
+"""
+Long-lived forecasting service that keeps the Chronos pipeline resident.
+
+    python -m src.models.serving --data data/raw/test.csv --port 8765
+    python -m src.models.serving --data data/raw/test.csv --socket /tmp/forecast.sock
+
+``POST /forecast`` with ``{"well": "FIELD4"}`` (history from the loaded data)
+or ``{"history": [...]}``, and optionally ``"horizon"``, returns
+``{"quantiles": {"0.1": [...], "0.5": [...], "0.9": [...]}, "cached": false}``.
+``GET /health`` and ``GET /stats`` report liveness and batching/cache counters.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .predict_model import forecast_wells
+from .registry import get_pipeline
+
+def history_key(history, prediction_length):
+    """
+    Cache key of a forecast request: a hash of the float32 history and the horizon.
+    """
+    digest = hashlib.sha256(np.ascontiguousarray(history, dtype=np.float32).tobytes())
+    digest.update(str(prediction_length).encode())
+    return digest.hexdigest()
+
+class ForecastService:
+    """
+    Micro-batching front end over a forecasting pipeline.
+
+    Concurrent ``forecast`` calls are queued and merged into one
+    ``forecast_wells`` call of up to ``max_batch_size`` histories; a batch is
+    sent when it is full or ``max_wait_ms`` after its first request, which
+    bounds the latency added by batching. Inference runs on one background
+    thread so the event loop keeps accepting requests. Results are kept in
+    an LRU cache of ``cache_size`` entries keyed by ``history_key``, and
+    identical requests already in flight share one result.
+
+    ``pipeline`` is a pipeline object or a registry name.
+    """
+
+    def __init__(self, pipeline='chronos', prediction_length=6, max_batch_size=32, max_wait_ms=10.0,
+                 cache_size=1024, num_samples=24, quantile_levels=(0.1, 0.5, 0.9)):
+        self.pipeline = get_pipeline(pipeline) if isinstance(pipeline, str) else pipeline
+        self.prediction_length = prediction_length
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self.num_samples = num_samples
+        self.quantile_levels = tuple(quantile_levels)
+        self.cache = OrderedDict()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'batches': 0, 'batched_requests': 0, 'inference_s': 0.0}
+        self._queue = None
+        self._inflight = {}
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._executor.shutdown(wait=True)
+
+    async def forecast(self, history, prediction_length=None):
+        """
+        Forecast one history; returns ``(quantiles, cached)`` with one array per quantile level.
+
+        Raises ``ValueError`` unless ``prediction_length`` is a positive int (or None for the default)
+        and ``history`` is a non-empty, finite 1-D series.
+        """
+        if prediction_length is None:
+            prediction_length = self.prediction_length
+        if isinstance(prediction_length, bool) or not isinstance(prediction_length, int) or prediction_length < 1:
+            raise ValueError(f"Horizon must be a positive integer, got {prediction_length!r}")
+        history = np.asarray(history, dtype=np.float32)
+        if history.ndim != 1 or history.size == 0 or not np.isfinite(history).all():
+            raise ValueError(f"History must be a non-empty 1-D series of finite values, got shape {history.shape}")
+        key = history_key(history, prediction_length)
+        self.stats['requests'] += 1
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return self.cache[key], True
+        if key in self._inflight:
+            self.stats['cache_hits'] += 1
+            return await asyncio.shield(self._inflight[key]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        await self._queue.put((key, history, prediction_length, future))
+        return await asyncio.shield(future), False
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._run_batch(batch)
+
+    async def _forecast_batch(self, batch):
+        # Forecast the longest horizon requested and truncate, as evaluate_chronos_batch does
+        horizon = max(prediction_length for _, _, prediction_length, _ in batch)
+        contexts = {i: history for i, (_, history, _, _) in enumerate(batch)}
+        start = time.perf_counter()
+        forecasts = await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(forecast_wells, self.pipeline, contexts, horizon, batch_size=len(batch),
+                                    num_samples=self.num_samples, quantile_levels=self.quantile_levels))
+        self.stats['inference_s'] += time.perf_counter() - start
+        self.stats['batches'] += 1
+        self.stats['batched_requests'] += len(batch)
+        return [tuple(q[:prediction_length] for q in forecasts[i])
+                for i, (_, _, prediction_length, _) in enumerate(batch)]
+
+    async def _run_batch(self, batch):
+        # A failure only fails this batch's requests; the batch loop keeps serving
+        try:
+            results = await self._forecast_batch(batch)
+        except Exception as e:
+            if len(batch) > 1:
+                # Retry one request at a time so only the request that broke the batch fails
+                for request in batch:
+                    await self._run_batch([request])
+                return
+            for key, _, _, future in batch:
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (key, _, _, future), quantiles in zip(batch, results):
+            self.cache[key] = quantiles
+            self.cache.move_to_end(key)
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(quantiles)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+class ForecastServer:
+    """
+    Minimal HTTP/1.1 (keep-alive) JSON server for a ``ForecastService``, over TCP or a Unix socket.
+
+    ``histories`` maps well name to its producing history, so clients can
+    ask for a well by name.
+    """
+
+    def __init__(self, service, histories=None):
+        self.service = service
+        self.histories = histories or {}
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        await self.service.start()
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.service.stop()
+
+    async def _route(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'wells': len(self.histories)}
+        if method == 'GET' and path == '/stats':
+            return 200, {**self.service.stats, 'cache_entries': len(self.service.cache)}
+        if method != 'POST' or path != '/forecast':
+            return 404, {'error': f'No route for {method} {path}'}
+
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            return 400, {'error': 'Request body must be JSON'}
+        history = request.get('history')
+        well = request.get('well')
+        if history is None:
+            if well not in self.histories:
+                return 404, {'error': f"Unknown well '{well}'"}
+            history = self.histories[well]
+        if not len(history):
+            return 400, {'error': 'Empty history'}
+        try:
+            quantiles, cached = await self.service.forecast(history, request.get('horizon'))
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        return 200, {'well': well, 'cached': cached,
+                     'quantiles': {str(level): q.tolist() for level, q in zip(self.service.quantile_levels, quantiles)}}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                try:
+                    status, payload = await self._route(method, path, body)
+                except Exception as e:
+                    status, payload = 500, {'error': f'{type(e).__name__}: {e}'}
+                data = json.dumps(payload).encode()
+                reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found'}.get(status, 'Internal Server Error')
+                writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                             f'Content-Length: {len(data)}\r\n\r\n'.encode() + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+def load_histories(data_path):
+    """
+    Producing oil history of every well in a production CSV, as used by ``predict_oil_production``.
+    """
+    from ..data.make_dataset import WellStore, read_production_csv
+    df = read_production_csv(data_path, use_cache=True)
+    store = WellStore.from_frame(df[['well_name', 'oil']])
+    histories = {}
+    for well in store.wells:
+        oil = store.get(well, 'oil')
+        histories[str(well)] = oil[oil > 0]
+    return histories
+
+async def request_forecast(reader, writer, payload):
+    """
+    Send one keep-alive ``POST /forecast`` on an open connection and return the decoded response.
+    """
+    body = json.dumps(payload).encode()
+    writer.write(b'POST /forecast HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                 + f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    response = json.loads(await reader.readexactly(int(headers['content-length'])))
+    return int(status_line.split()[1]), response
+
+async def _serve(args):
+    histories = load_histories(args.data) if args.data else {}
+    service = ForecastService(args.pipeline, prediction_length=args.horizon, max_batch_size=args.max_batch_size,
+                              max_wait_ms=args.max_wait_ms, cache_size=args.cache_size, num_samples=args.num_samples,
+                              quantile_levels=sorted(args.quantiles))
+    server = ForecastServer(service, histories)
+    await server.start(args.host, args.port, path=args.socket)
+    where = args.socket or f'http://{args.host}:{server.port}'
+    print(f"Serving forecasts for {len(histories)} wells on {where}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', help="production CSV whose wells can be requested by name")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', help="listen on this Unix socket instead of TCP")
+    parser.add_argument('--pipeline', default='chronos', help="registry pipeline name ('stub' for offline use)")
+    parser.add_argument('--horizon', type=int, default=6)
+    parser.add_argument('--num-samples', type=int, default=24)
+    parser.add_argument('--quantiles', type=float, nargs='+', default=[0.1, 0.5, 0.9])
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0, help="latency budget for filling a batch")
+    parser.add_argument('--cache-size', type=int, default=1024)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import torch
+
+
+class StubChronosPipeline:
+    """
+    Small local stand-in for ``ChronosPipeline``.
+
+    It exposes the same ``predict`` signature and output shape
+    (``[num_series, num_samples, prediction_length]``) so batching, caching
+    and serving code can be exercised and benchmarked on CPU without
+    downloading the T5 weights. The forecast is a tiny MLP over the mean-scaled
+    context, plus optional sampling noise.
+    """
+
+    def __init__(self, context_length=64, hidden_size=32, noise_scale=0.1, seed=0):
+        generator = torch.Generator().manual_seed(seed)
+        self.context_length = context_length
+        self.noise_scale = noise_scale
+        self.weight_in = torch.randn(context_length, hidden_size, generator=generator) / context_length
+        self.weight_out = torch.randn(hidden_size, 1, generator=generator) / hidden_size
+        self.generator = torch.Generator().manual_seed(seed + 1)
+        self.calls = 0
+
+    def _prepare_context(self, context):
+        """
+        Stack, left-pad and truncate the context to ``context_length``, as Chronos does.
+        """
+        if isinstance(context, list):
+            length = max(len(c) for c in context)
+            context = torch.stack([
+                torch.cat([torch.full((length - len(c),), float('nan')), c.to(torch.float32)])
+                for c in context
+            ])
+        if context.ndim == 1:
+            context = context.unsqueeze(0)
+        context = context.to(torch.float32)[:, -self.context_length:]
+        if context.shape[-1] < self.context_length:
+            padding = torch.full((context.shape[0], self.context_length - context.shape[-1]), float('nan'))
+            context = torch.cat([padding, context], dim=-1)
+        return context
+
+    def predict(self, context, prediction_length=None, num_samples=None, temperature=None,
+                top_k=None, top_p=None, limit_prediction_length=True):
+        """
+        Return sample paths of shape ``[num_series, num_samples, prediction_length]``.
+        """
+        self.calls += 1
+        prediction_length = prediction_length or 12
+        num_samples = num_samples or 20
+        temperature = 1.0 if temperature is None else temperature
+
+        context = self._prepare_context(context)
+        observed = ~torch.isnan(context)
+        scale = torch.nan_to_num(context.abs(), nan=0.0).sum(-1) / observed.sum(-1).clamp(min=1)
+        scale = torch.where(scale > 0, scale, torch.ones_like(scale))
+        scaled = torch.nan_to_num(context, nan=0.0) / scale.unsqueeze(-1)
+
+        level = torch.relu(scaled @ self.weight_in) @ self.weight_out + 1.0
+        steps = torch.arange(1, prediction_length + 1, dtype=torch.float32)
+        decline = torch.exp(-0.01 * steps)
+        paths = (level * decline).unsqueeze(1).expand(-1, num_samples, -1)
+        if self.noise_scale and temperature:
+            noise = torch.randn(paths.shape, generator=self.generator)
+            paths = paths * (1.0 + self.noise_scale * temperature * noise)
+        return paths * scale.view(-1, 1, 1)
@@ -1,18 +1,22 @@
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
 from sklearn.metrics import mean_squared_error
 import torch
-from chronos import ChronosPipeline
-from joblib import Parallel, delayed
 import os
-import pickle
+import time
+from .predict_model import forecast_wells
+from .registry import get_pipeline
+from .result_cache import ResultCache, make_key
+from .batch_regression import POLYNOMIAL_MODELS, evaluate_polynomial_batch
+from .decline_curve import ARPS_MODELS, arps_rate, evaluate_arps_batch, fit_arps_batch
+from ..data.make_dataset import WellStore
+from ..instrumentation import record_timing
 
 def load_chronos_pipeline():
     """
     Load the pre-trained Chronos pipeline.
     """
+    from chronos import ChronosPipeline
     return ChronosPipeline.from_pretrained("amazon/chronos-t5-small", torch_dtype=torch.bfloat16)
 
 def train_and_evaluate_single_model(model, model_name, X_train, X_test, y_train, y_test):
@@ -26,9 +30,13 @@ def train_and_evaluate_single_model(model, model_name, X_train, X_test, y_train,
         regressor.fit(X_train_poly, y_train)
         y_pred = regressor.predict(X_test_poly)
     elif model_name == 'Chronos':
-        context = torch.tensor(y_train.flatten(), dtype=torch.float32)
-        forecast = model.predict(context, len(y_test), num_samples=1, temperature=1.0, top_k=50, top_p=1.0)
-        y_pred = forecast[0, 0, :].numpy().reshape(-1, 1)
+        forecast = forecast_wells(model, {0: y_train.flatten()}, len(y_test), num_samples=1, quantile_levels=(0.5,))
+        y_pred = forecast[0][0].reshape(-1, 1)
+    elif model_name in ARPS_MODELS:
+        origin = X_train[0, 0]
+        fit = fit_arps_batch((X_train - origin).reshape(1, -1), y_train.reshape(1, -1),
+                             np.ones((1, len(y_train)), dtype=bool), model)
+        y_pred = arps_rate(X_test - origin, fit['qi'][0], fit['di'][0], fit['b'][0])
     else:
         model.fit(X_train, y_train)
         y_pred = model.predict(X_test)
@@ -36,58 +44,128 @@ def train_and_evaluate_single_model(model, model_name, X_train, X_test, y_train,
     rmse = np.sqrt(mean_squared_error(y_test, y_pred))
     return rmse
 
-def train_and_evaluate_models(df, well_list, cache_dir='model_cache', use_subset=False, subset_size=10):
+def evaluate_chronos_batch(pipeline, windows, batch_size=32, num_samples=1, min_context=1):
+    """
+    Evaluate Chronos on many wells at once, one ``pipeline.predict`` call per batch.
+
+    ``windows`` maps well name to ``(y_train, y_test)``. Wells are forecast
+    over the longest test horizon and truncated to their own, which is
+    equivalent for an autoregressive model. The point forecast is the median
+    of ``num_samples`` sample paths. Returns a dict of RMSE per well; wells
+    with fewer than ``min_context`` training months (or no test months) are
+    left out of the batch and get NaN, as in the regression and Arps paths.
+    """
+    rmse = {well: np.nan for well in windows}
+    usable = {well: (y_train, y_test) for well, (y_train, y_test) in windows.items()
+              if len(y_train) >= max(min_context, 1) and len(y_test)}
+    if not usable:
+        return rmse
+    contexts = {well: y_train.flatten() for well, (y_train, _) in usable.items()}
+    horizon = max(len(y_test) for _, y_test in usable.values())
+    forecasts = forecast_wells(pipeline, contexts, horizon, batch_size=batch_size, num_samples=num_samples,
+                               quantile_levels=(0.5,))
+    for well, (_, y_test) in usable.items():
+        y_pred = forecasts[well][0][:len(y_test)].reshape(-1, 1)
+        rmse[well] = np.sqrt(mean_squared_error(y_test, y_pred))
+    return rmse
+
+def split_train_test(dat):
+    """
+    Split a well's data into the last 12 months for testing and the 24 months before for training.
+
+    ``dat`` is a well's DataFrame or the column dict from ``WellStore.well``.
+    """
+    X = np.asarray(dat['months_since_first_production']).reshape(-1, 1)
+    y = np.asarray(dat['oil']).reshape(-1, 1)
+
+    data_length = len(X)
+    test_start_index = max(0, data_length - 12)
+    train_end_index = test_start_index
+    train_start_index = max(0, train_end_index - 24)
+
+    X_train, X_test = X[train_start_index:train_end_index], X[test_start_index:]
+    y_train, y_test = y[train_start_index:train_end_index], y[test_start_index:]
+    return X_train, X_test, y_train, y_test
+
+def train_and_evaluate_models(df, well_list, cache_dir='model_cache', use_subset=False, subset_size=10,
+                              chronos_batch_size=32, pipeline_name='chronos', max_cache_entries=100000, models=None,
+                              chronos_num_samples=1):
     """
     Train and evaluate multiple models for each well, with caching and optional subset usage.
+
+    ``df`` may be the filtered DataFrame or a ``WellStore``; ``models``
+    restricts the evaluation to some model names. Results are cached per
+    (well, model) under a hash of the well's data and the model config, and
+    each model is evaluated for all uncached wells in one batched pass.
     """
-    models = {
-        'Linear': LinearRegression(),
-        'Polynomial (Degree 2)': (PolynomialFeatures(degree=2), LinearRegression()),
-        'Polynomial (Degree 3)': (PolynomialFeatures(degree=3), LinearRegression()),
-        'Chronos': load_chronos_pipeline()
-    }
+    all_models = list(POLYNOMIAL_MODELS) + list(ARPS_MODELS) + ['Chronos']
+    models = all_models if models is None else list(models)
+    unknown = sorted(set(models) - set(all_models))
+    if unknown:
+        raise ValueError(f"Unknown models {unknown}; choose from {all_models}")
+    degrees = {model_name: degree for model_name, degree in POLYNOMIAL_MODELS.items() if model_name in models}
+    arps_kinds = {model_name: kind for model_name, kind in ARPS_MODELS.items() if model_name in models}
     
     if use_subset:
         well_list = well_list[:subset_size]
     
     os.makedirs(cache_dir, exist_ok=True)
-    cache_file = os.path.join(cache_dir, f'results_cache{"_subset" if use_subset else ""}.pkl')
+    cache = ResultCache(os.path.join(cache_dir, 'result_cache.pkl'), max_entries=max_cache_entries)
+    
+    signatures = {model_name: repr((model_name, 'least squares', degree)) for model_name, degree in degrees.items()}
+    signatures.update({model_name: repr((model_name, 'arps', kind)) for model_name, kind in arps_kinds.items()})
+    if 'Chronos' in models:
+        signatures['Chronos'] = repr(('Chronos', pipeline_name, f'num_samples={chronos_num_samples}'))
+    results = {model_name: {} for model_name in signatures}
+    
+    store = df if isinstance(df, WellStore) else WellStore.from_frame(df)
+    start = time.perf_counter()
+    splits = {well: split_train_test(store.well(well)) for well in well_list}
+    record_timing('train_and_evaluate_models', 'split_train_test', time.perf_counter() - start, wells=len(splits))
     
-    if os.path.exists(cache_file):
-        with open(cache_file, 'rb') as f:
-            return pd.DataFrame(pickle.load(f))
+    keys = {}
+    for well, split in splits.items():
+        for model_name, signature in signatures.items():
+            keys[well, model_name] = make_key(signature, *split)
+            rmse = cache.get(keys[well, model_name])
+            if rmse is not None:
+                results[model_name][well] = rmse
+    for model_name in signatures:
+        record_timing('train_and_evaluate_models', model_name, 0.0, cache_hits=len(results[model_name]))
     
-    results = {model: [] for model in models}
+    def store_results(model_name, batch_results, elapsed):
+        for well, rmse in batch_results.items():
+            results[model_name][well] = rmse
+            cache.put(keys[well, model_name], rmse)
+        record_timing('train_and_evaluate_models', model_name, elapsed, wells=len(batch_results))
     
-    def process_well(well):
-        dat = df[df.well_name == well]
-        X = dat.months_since_first_production.values.reshape(-1, 1)
-        y = dat.oil.values.reshape(-1, 1)
-        
-        data_length = len(X)
-        test_start_index = max(0, data_length - 12)
-        train_end_index = test_start_index
-        train_start_index = max(0, train_end_index - 24)
-        
-        X_train, X_test = X[train_start_index:train_end_index], X[test_start_index:]
-        y_train, y_test = y[train_start_index:train_end_index], y[test_start_index:]
-        
-        well_results = {}
-        for model_name, model in models.items():
-            well_results[model_name] = train_and_evaluate_single_model(model, model_name, X_train, X_test, y_train, y_test)
-        return well_results
+    for model_name, degree in degrees.items():
+        pending = {well: split for well, split in splits.items() if well not in results[model_name]}
+        if pending:
+            start = time.perf_counter()
+            batch_results = evaluate_polynomial_batch(pending, {model_name: degree})[model_name]
+            store_results(model_name, batch_results, time.perf_counter() - start)
     
-    # Use parallel processing
-    well_results = Parallel(n_jobs=-1)(delayed(process_well)(well) for well in well_list)
+    for model_name, kind in arps_kinds.items():
+        pending = {well: split for well, split in splits.items() if well not in results[model_name]}
+        if pending:
+            start = time.perf_counter()
+            batch_results = evaluate_arps_batch(pending, {model_name: kind})[model_name]
+            store_results(model_name, batch_results, time.perf_counter() - start)
     
-    for well_result in well_results:
-        for model_name, rmse in well_result.items():
-            results[model_name].append(rmse)
+    windows = {well: (y_train, y_test) for well, (_, _, y_train, y_test) in splits.items()
+               if 'Chronos' in signatures and well not in results['Chronos']}
+    if windows:
+        pipeline = get_pipeline(pipeline_name)
+        start = time.perf_counter()
+        chronos_results = evaluate_chronos_batch(pipeline, windows, batch_size=chronos_batch_size,
+                                                 num_samples=chronos_num_samples)
+        store_results('Chronos', chronos_results, time.perf_counter() - start)
     
-    # Cache the results
-    with open(cache_file, 'wb') as f:
-        pickle.dump(results, f)
+    cache.save()
+    print(f"Result cache: {cache.summary()}")
     
-    return pd.DataFrame(results, index=well_list)
+    return pd.DataFrame({model_name: [results[model_name][well] for well in well_list] for model_name in signatures},
+                        index=well_list)
 
 # Add any other model training or evaluation functions here
\ No newline at end of file
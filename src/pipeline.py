@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline graph.
+
+    ``func(context)`` reads its inputs from the shared ``context`` dict and
+    returns a dict of results that is merged back into it. ``params`` is any
+    repr-able value the stage's output depends on (its slice of the config,
+    a data file fingerprint); together with the fingerprints of ``deps`` it
+    decides whether the stage must rerun. Stages with ``outputs`` write those
+    files and are skipped when their fingerprint is unchanged and the files
+    exist; stages without outputs only produce in-memory results and run
+    whenever a stage that needs them runs.
+    """
+    name: str
+    func: object
+    deps: tuple = ()
+    params: object = None
+    outputs: tuple = field(default_factory=tuple)
+
+def topological_order(stages):
+    """
+    Return stages ordered so that every stage comes after its dependencies.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    ordered, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage graph has a cycle through '{name}'")
+        if name not in by_name:
+            raise KeyError(f"Unknown stage '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        ordered.append(by_name[name])
+
+    for stage in stages:
+        visit(stage.name)
+    return ordered
+
+def stage_fingerprints(stages):
+    """
+    Hash each stage's name and params together with its dependencies' fingerprints.
+    """
+    fingerprints = {}
+    for stage in topological_order(stages):
+        digest = hashlib.sha256(repr((stage.name, stage.params)).encode())
+        for dep in stage.deps:
+            digest.update(fingerprints[dep].encode())
+        fingerprints[stage.name] = digest.hexdigest()
+    return fingerprints
+
+def descendants(stages, names):
+    """
+    Return ``names`` and every stage that depends on them, directly or not.
+    """
+    selected = set(names)
+    for stage in topological_order(stages):
+        if selected.intersection(stage.deps):
+            selected.add(stage.name)
+    return selected
+
+def select_stages(stages, only=None, start=None):
+    """
+    Names of the stages chosen by ``--only`` (exactly those) or ``--from`` (that stage and its descendants).
+    """
+    names = {stage.name for stage in stages}
+    for name in list(only or ()) + ([start] if start else []):
+        if name not in names:
+            raise KeyError(f"Unknown stage '{name}'; choose from {', '.join(sorted(names))}")
+    if only:
+        return set(only)
+    if start:
+        return descendants(stages, [start])
+    return names
+
+def _load_state(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def run_stages(stages, context=None, selected=None, state_path=None, max_workers=1, force=False, report=None,
+               forced=()):
+    """
+    Run the selected stages as a dependency graph.
+
+    A selected stage with outputs runs when ``force`` is set, it is named in
+    ``forced`` (stages the user asked for explicitly), its fingerprint
+    differs from the one recorded in ``state_path`` or an output is missing;
+    in-memory stages run when a running stage needs them or when they are
+    selected explicitly through ``only``. Up to ``max_workers`` independent
+    stages run at once in threads. Each stage is timed as a ``report`` stage
+    when a ``RunReport`` is given (memory figures overlap when stages run
+    concurrently). Returns ``(ran, skipped)`` lists of stage names.
+    """
+    context = {} if context is None else context
+    by_name = {stage.name: stage for stage in stages}
+    selected = set(by_name) if selected is None else set(selected)
+    fingerprints = stage_fingerprints(stages)
+    state = _load_state(state_path)
+
+    def up_to_date(stage):
+        return (not force and stage.name not in forced and state.get(stage.name) == fingerprints[stage.name]
+                and all(os.path.exists(path) for path in stage.outputs))
+
+    targets = {name for name in selected if by_name[name].outputs and not up_to_date(by_name[name])}
+    targets |= {name for name in selected if not by_name[name].outputs and selected != set(by_name)}
+    required = set()
+    for stage in reversed(topological_order(stages)):
+        if stage.name in targets or any(stage.name in by_name[name].deps for name in required):
+            required.add(stage.name)
+    skipped = [stage.name for stage in topological_order(stages) if stage.name in selected and stage.name not in required]
+    for name in skipped:
+        print(f"Skipping stage '{name}': inputs and outputs unchanged (force to rerun)")
+
+    lock = threading.Lock()
+    ran = []
+
+    def execute(stage):
+        with report.stage(stage.name) if report is not None else nullcontext():
+            results = stage.func(context) or {}
+        with lock:
+            context.update(results)
+            ran.append(stage.name)
+            if stage.outputs and state_path:
+                state[stage.name] = fingerprints[stage.name]
+                os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+                with open(state_path, 'w') as f:
+                    json.dump(state, f, indent=1)
+
+    pending = [stage for stage in topological_order(stages) if stage.name in required]
+    done, running, error = set(), {}, None
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or running:
+            if error is None:
+                for stage in [stage for stage in pending if all(dep in done for dep in stage.deps if dep in required)]:
+                    pending.remove(stage)
+                    running[executor.submit(execute, stage)] = stage
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                if future.exception() is not None and error is None:
+                    error = future.exception()
+                done.add(stage.name)
+    if error is not None:
+        raise error
+    return ran, skipped
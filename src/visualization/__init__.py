@@ -1,9 +1,19 @@
-from .visualize import (
-    plot_oil_production,
-    plot_top_5_wells,
-    plot_cumulative_production,
-    plot_total_production,
-    plot_producing_wells,
-    plot_gor,
-    plot_model_comparison
-)
\ No newline at end of file
+from .._lazy import lazy_exports
+
+__all__ = ['plot_oil_production', 'plot_oil_production_for_wells', 'plot_top_5_wells', 'plot_cumulative_production',
+           'plot_total_production', 'plot_producing_wells', 'plot_gor', 'plot_model_comparison', 'plot_forecasts',
+           'FigureSpec', 'render_figures']
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    'plot_oil_production': '.visualize',
+    'plot_oil_production_for_wells': '.visualize',
+    'plot_top_5_wells': '.visualize',
+    'plot_cumulative_production': '.visualize',
+    'plot_total_production': '.visualize',
+    'plot_producing_wells': '.visualize',
+    'plot_gor': '.visualize',
+    'plot_model_comparison': '.visualize',
+    'plot_forecasts': '.visualize',
+    'FigureSpec': '.render',
+    'render_figures': '.render',
+})
@@ -0,0 +1,150 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = '.render_manifest.json'
+# Renders running on several threads (pipeline stages) share one manifest file
+_MANIFEST_LOCK = threading.Lock()
+
+@dataclass
+class FigureSpec:
+    """
+    Everything needed to render one figure in any process.
+
+    ``builder`` is a module-level function called as ``builder(**data)`` that
+    returns a Plotly figure or a matplotlib ``Figure``; ``output_file`` is
+    where the image is written.
+    """
+    builder: object
+    output_file: str
+    data: dict = field(default_factory=dict)
+
+def _update_hash(digest, value):
+    """
+    Feed a figure's input data into a hash, handling arrays and frames by content.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'{value.dtype.str}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(repr(key).encode())
+            _update_hash(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_hash(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+@lru_cache(maxsize=None)
+def _builder_code(builder):
+    """
+    Source of the module defining ``builder``, so edits to it or to helpers it calls change the hash.
+    """
+    try:
+        return inspect.getsource(sys.modules[builder.__module__])
+    except (KeyError, OSError, TypeError):
+        return builder.__code__.co_code.hex() + repr(builder.__code__.co_consts)
+
+@lru_cache(maxsize=None)
+def _library_versions():
+    versions = []
+    for package in ('plotly', 'kaleido', 'matplotlib'):
+        try:
+            versions.append(f'{package}=={metadata.version(package)}')
+        except metadata.PackageNotFoundError:
+            versions.append(f'{package} missing')
+    return ';'.join(versions)
+
+def spec_hash(spec):
+    """
+    Hash a spec's builder (name and code), the plotting library versions and the input data.
+    """
+    digest = hashlib.sha256(f'{spec.builder.__module__}.{spec.builder.__qualname__}'.encode())
+    digest.update(_builder_code(spec.builder).encode())
+    digest.update(_library_versions().encode())
+    _update_hash(digest, spec.data)
+    return digest.hexdigest()
+
+def _load_manifest(path):
+    # A missing or unreadable manifest only costs a re-render
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _init_render_worker():
+    """
+    Process-pool initializer: headless matplotlib and one kaleido process per worker.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    try:
+        import plotly.io as pio
+        pio.kaleido.scope
+    except (AttributeError, ImportError, ValueError):
+        pass
+
+def render_figure(spec):
+    """
+    Build and write one figure, returning its output file.
+    """
+    fig = spec.builder(**spec.data)
+    if hasattr(fig, 'write_image'):
+        fig.write_image(spec.output_file)
+    else:
+        fig.savefig(spec.output_file)
+    return spec.output_file
+
+def render_figures(specs, n_jobs=1, manifest_path=None, force=False):
+    """
+    Render figure specs, skipping those whose inputs have not changed since the last render.
+
+    A JSON manifest (by default next to the first output file) records the
+    input hash of each rendered file; a spec is skipped when its file exists
+    and its hash matches, unless ``force`` is set. With ``n_jobs > 1`` the figures are rendered in a
+    process pool whose workers each keep one kaleido process alive. Returns
+    ``(rendered, skipped)`` lists of output files.
+    """
+    if not specs:
+        return [], []
+    if manifest_path is None:
+        manifest_path = os.path.join(os.path.dirname(specs[0].output_file), MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+
+    pending, skipped, hashes = [], [], {}
+    for spec in specs:
+        hashes[spec.output_file] = spec_hash(spec)
+        if not force and os.path.exists(spec.output_file) and manifest.get(spec.output_file) == hashes[spec.output_file]:
+            skipped.append(spec.output_file)
+        else:
+            pending.append(spec)
+
+    if n_jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker) as executor:
+            rendered = list(executor.map(render_figure, pending, chunksize=max(1, len(pending) // (4 * n_jobs))))
+    else:
+        rendered = [render_figure(spec) for spec in pending]
+
+    with _MANIFEST_LOCK:
+        manifest = _load_manifest(manifest_path)
+        manifest.update({output_file: hashes[output_file] for output_file in rendered})
+        tmp_path = f"{manifest_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, manifest_path)
+    return rendered, skipped
@@ -1,8 +1,12 @@
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import seaborn as sns
 import os
 import plotly.graph_objects as go
-from plotly.io import write_image
+from matplotlib.figure import Figure
+from ..data.make_dataset import WellStore, select_well
+from ..features.field_aggregates import field_aggregates_from_pivot
+from .render import FigureSpec, render_figures
 
 def ensure_output_dir(output_dir):
     """Ensure the output directory exists."""
@@ -10,129 +14,172 @@ def ensure_output_dir(output_dir):
         os.makedirs(output_dir)
     print(f"Output directory ensured: {output_dir}")
 
-def plot_oil_production(df, well_name, output_dir):
-    ensure_output_dir(output_dir)
-    df_vis = df[df['well_name'] == well_name]
+def _render(specs, description, n_jobs=1, force=False):
+    """Render specs and report each output file; ``force`` re-renders unchanged ones."""
+    rendered, skipped = render_figures(specs, n_jobs=n_jobs, force=force)
+    for output_file in skipped:
+        print(f"Skipped unchanged {description} plot: {output_file}")
+    for output_file in rendered:
+        print(f"Attempted to save {description} plot to: {output_file}")
+        if os.path.exists(output_file):
+            print(f"File successfully saved: {output_file}")
+        else:
+            print(f"Failed to save file: {output_file}")
+
+def _line_figure(x, y, name, title, xaxis_title, yaxis_title):
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df_vis['months_since_first_production'], y=df_vis['oil'],
-                             mode='lines', name=well_name))
-    fig.update_layout(title=f'Oil Production Over Time for {well_name}',
-                      xaxis_title='Months Since Production',
-                      yaxis_title='Oil Production')
-    output_file = os.path.join(output_dir, f'oil_production_{well_name}.png')
-    fig.write_image(output_file)
-    print(f"Attempted to save oil production plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
-
-def plot_top_5_wells(df, output_dir):
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=name))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
+
+def build_oil_production_figure(months, oil, well_name):
+    return _line_figure(months, oil, well_name, f'Oil Production Over Time for {well_name}',
+                        'Months Since Production', 'Oil Production')
+
+def build_top_5_wells_figure(df_top_5):
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    sns.lineplot(data=df_top_5, x='cumulative_oil_production', y='oil', hue='well_name', ax=ax)
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Cumulative Oil Production (log scale)')
+    ax.set_ylabel('Oil Production (log scale)')
+    ax.set_title('Log-log Plot of Oil Production Over Time for Top 5 Wells')
+    return fig
+
+def build_cumulative_production_figure(df_filtered):
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    sns.lineplot(data=df_filtered, x='months_since_first_production', y='cumulative_oil_production', hue='well_name', ax=ax)
+    ax.set_xlabel('Months Since Production')
+    ax.set_ylabel('Cumulative Oil Production')
+    ax.set_title('Cumulative Oil Production Over Time for Top 5 Wells')
+    return fig
+
+def build_total_production_figure(index, values, production_type):
+    label = f'Total {production_type.capitalize()} Production'
+    return _line_figure(index, values, label, f'{label} Over Time', 'Timestamp', label)
+
+def build_producing_wells_figure(index, values):
+    return _line_figure(index, values, 'Number of producing wells', 'Number of producing wells',
+                        'Timestamp', 'Number of producing wells')
+
+def build_gor_figure(index, values):
+    return _line_figure(index, values, 'GOR', 'Total GOR Over Time', 'Timestamp', 'Total GOR')
+
+def build_model_comparison_figure(results_df):
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    results_df.boxplot(ax=ax)
+    ax.set_title('Boxplot of RMSE Values')
+    ax.set_ylabel('RMSE')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.set_ylim(0, 40000)
+    return fig
+
+def build_forecast_figure(history, low, median, high, well_name, interval_label="80% prediction interval"):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    forecast_index = np.arange(len(history), len(history) + len(median))
+    ax.plot(np.arange(len(history)), history, color="royalblue", label="Historical data")
+    ax.plot(forecast_index, median, color="tomato", label="Median forecast")
+    ax.fill_between(forecast_index, low, high, color="tomato", alpha=0.3, label=interval_label)
+    ax.legend()
+    ax.grid(True)
+    ax.set_title(f"Oil Production Forecast for {well_name}")
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Oil Production")
+    return fig
+
+def _oil_production_spec(df, well_name, output_dir):
+    df_vis = select_well(df, well_name)
+    return FigureSpec(build_oil_production_figure, os.path.join(output_dir, f'oil_production_{well_name}.png'),
+                      {'months': np.asarray(df_vis['months_since_first_production']),
+                       'oil': np.asarray(df_vis['oil']), 'well_name': well_name})
+
+def plot_oil_production(df, well_name, output_dir, force=False):
+    """Plot a well's oil production; ``df`` may be a DataFrame or a WellStore."""
+    ensure_output_dir(output_dir)
+    _render([_oil_production_spec(df, well_name, output_dir)], 'oil production', force=force)
+
+def plot_oil_production_for_wells(df, well_names, output_dir, n_jobs=1, force=False):
+    """Plot oil production for many wells, rendering the figures in ``n_jobs`` processes."""
+    ensure_output_dir(output_dir)
+    store = df if isinstance(df, WellStore) else WellStore.from_frame(df)
+    _render([_oil_production_spec(store, well_name, output_dir) for well_name in well_names],
+            'oil production', n_jobs=n_jobs, force=force)
+
+def plot_top_5_wells(df, output_dir, force=False):
     ensure_output_dir(output_dir)
-    well_production = df.groupby('well_name')['oil'].sum()
+    well_production = df.groupby('well_name', observed=True)['oil'].sum()
     top_5_wells = well_production.nlargest(5)
     df_filtered = df[df.well_name.isin(top_5_wells.index)]
-    
-    plt.figure(figsize=(12, 8))
-    sns.lineplot(data=df_filtered, x='cumulative_oil_production', y='oil', hue='well_name')
-    plt.xscale('log')
-    plt.yscale('log')
-    plt.xlabel('Cumulative Oil Production (log scale)')
-    plt.ylabel('Oil Production (log scale)')
-    plt.title('Log-log Plot of Oil Production Over Time for Top 5 Wells')
-    output_file = os.path.join(output_dir, 'top_5_wells.png')
-    plt.savefig(output_file)
-    plt.close()
-    print(f"Attempted to save top 5 wells plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
-
-def plot_cumulative_production(df_filtered, output_dir):
+    if isinstance(df_filtered['well_name'].dtype, pd.CategoricalDtype):
+        df_filtered = df_filtered.assign(well_name=df_filtered['well_name'].cat.remove_unused_categories())
+
+    columns = ['well_name', 'cumulative_oil_production', 'oil']
+    _render([FigureSpec(build_top_5_wells_figure, os.path.join(output_dir, 'top_5_wells.png'),
+                        {'df_top_5': df_filtered[columns]})], 'top 5 wells', force=force)
+
+def plot_cumulative_production(df_filtered, output_dir, force=False):
     ensure_output_dir(output_dir)
-    plt.figure(figsize=(12, 8))
-    sns.lineplot(data=df_filtered, x='months_since_first_production', y='cumulative_oil_production', hue='well_name')
-    plt.xlabel('Months Since Production')
-    plt.ylabel('Cumulative Oil Production')
-    plt.title('Cumulative Oil Production Over Time for Top 5 Wells')
-    output_file = os.path.join(output_dir, 'cumulative_production.png')
-    plt.savefig(output_file)
-    plt.close()
-    print(f"Attempted to save cumulative production plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
-
-def plot_total_production(series, production_type, output_dir):
+    columns = ['well_name', 'months_since_first_production', 'cumulative_oil_production']
+    _render([FigureSpec(build_cumulative_production_figure, os.path.join(output_dir, 'cumulative_production.png'),
+                        {'df_filtered': df_filtered[columns]})], 'cumulative production', force=force)
+
+def _as_field_aggregates(aggregates):
+    """Accept the dense pivot from ``load_and_preprocess_data`` for backward compatibility."""
+    if isinstance(aggregates.columns, pd.MultiIndex):
+        return field_aggregates_from_pivot(aggregates)
+    return aggregates
+
+def plot_total_production(aggregates, production_type, output_dir, force=False):
+    """Plot total field production from the frame built by ``compute_field_aggregates``."""
     ensure_output_dir(output_dir)
-    total_production = series[production_type].sum(axis=1)
+    total_production = _as_field_aggregates(aggregates)[production_type]
     total_production = total_production[total_production != 0]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=total_production.index, y=total_production.values, mode='lines', name=f'Total {production_type.capitalize()} Production'))
-    fig.update_layout(title=f'Total {production_type.capitalize()} Production Over Time',
-                      xaxis_title='Timestamp',
-                      yaxis_title=f'Total {production_type.capitalize()} Production')
+
     output_file = os.path.join(output_dir, f'total_{production_type}_production.png')
-    fig.write_image(output_file)
-    print(f"Attempted to save total {production_type} production plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
-
-def plot_producing_wells(series, output_dir):
+    _render([FigureSpec(build_total_production_figure, output_file,
+                        {'index': total_production.index, 'values': total_production.values,
+                         'production_type': production_type})], f'total {production_type} production', force=force)
+
+def plot_producing_wells(aggregates, output_dir, force=False):
+    """Plot the number of producing wells from the frame built by ``compute_field_aggregates``."""
     ensure_output_dir(output_dir)
-    series['oil'] = series['oil'].fillna(0)
-    non_zero_count = series['oil'].apply(lambda x: (x != 0).sum(), axis=1)
+    non_zero_count = _as_field_aggregates(aggregates)['producing_wells']
     non_zero_count = non_zero_count[non_zero_count != 0]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=non_zero_count.index, y=non_zero_count.values, mode='lines', name='Number of producing wells'))
-    fig.update_layout(title='Number of producing wells',
-                      xaxis_title='Timestamp',
-                      yaxis_title='Number of producing wells')
-    output_file = os.path.join(output_dir, 'producing_wells.png')
-    fig.write_image(output_file)
-    print(f"Attempted to save producing wells plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
-
-def plot_gor(series, output_dir):
+
+    _render([FigureSpec(build_producing_wells_figure, os.path.join(output_dir, 'producing_wells.png'),
+                        {'index': non_zero_count.index, 'values': non_zero_count.values})], 'producing wells',
+            force=force)
+
+def plot_gor(aggregates, output_dir, force=False):
+    """Plot the field GOR from the frame built by ``compute_field_aggregates``."""
     ensure_output_dir(output_dir)
-    GOR = series['gas_total'].sum(axis=1) / (series['oil'].sum(axis=1) + 1e-6)
+    GOR = _as_field_aggregates(aggregates)['gor']
     GOR = GOR[GOR != 0]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=GOR.index, y=GOR.values, mode='lines', name='GOR'))
-    fig.update_layout(title='Total GOR Over Time',
-                      xaxis_title='Timestamp',
-                      yaxis_title='Total GOR')
-    output_file = os.path.join(output_dir, 'gor.png')
-    fig.write_image(output_file)
-    print(f"Attempted to save GOR plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
-
-def plot_model_comparison(results_df, output_dir):
+
+    _render([FigureSpec(build_gor_figure, os.path.join(output_dir, 'gor.png'),
+                        {'index': GOR.index, 'values': GOR.values})], 'GOR', force=force)
+
+def plot_model_comparison(results_df, output_dir, force=False):
+    """
+    Boxplot RMSE per model, from a wide frame (one column per model) or a
+    tidy backtest frame indexed by (well, origin, model).
+    """
+    ensure_output_dir(output_dir)
+    if 'model' in (results_df.index.names or []):
+        results_df = results_df['rmse'].unstack('model')
+    _render([FigureSpec(build_model_comparison_figure, os.path.join(output_dir, 'model_comparison.png'),
+                        {'results_df': results_df})], 'model comparison', force=force)
+
+def plot_forecasts(histories, forecasts, output_dir, n_jobs=1, interval_label="80% prediction interval", force=False):
+    """Plot each well's history with its (low, median, high) forecast."""
     ensure_output_dir(output_dir)
-    plt.figure(figsize=(12, 8))
-    results_df.boxplot()
-    plt.title('Boxplot of RMSE Values')
-    plt.ylabel('RMSE')
-    plt.xticks(rotation=45)
-    plt.ylim(0, 40000)
-    output_file = os.path.join(output_dir, 'model_comparison.png')
-    plt.savefig(output_file)
-    plt.close()
-    print(f"Attempted to save model comparison plot to: {output_file}")
-    if os.path.exists(output_file):
-        print(f"File successfully saved: {output_file}")
-    else:
-        print(f"Failed to save file: {output_file}")
\ No newline at end of file
+    specs = []
+    for well_name, (low, median, high) in forecasts.items():
+        specs.append(FigureSpec(build_forecast_figure, os.path.join(output_dir, f'forecast_{well_name}.png'),
+                                {'history': np.asarray(histories[well_name]), 'low': low, 'median': median,
+                                 'high': high, 'well_name': well_name, 'interval_label': interval_label}))
+    _render(specs, 'forecast', n_jobs=n_jobs, force=force)
@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'raw', 'test.csv')
+
+
+@pytest.fixture
+def data_path():
+    """Path of the bundled production CSV."""
+    return DATA_PATH
+
+
+@pytest.fixture
+def make_filtered_frame():
+    """Factory for a processed-looking frame: monthly, uniform random oil per well."""
+    def make(n_wells=6, n_months=40, seed=0):
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({
+            'well_name': np.repeat([f'W{i}' for i in range(n_wells)], n_months),
+            'period': np.tile(pd.date_range('2000-01-01', periods=n_months, freq='MS'), n_wells),
+            'months_since_first_production': np.tile(np.arange(n_months), n_wells),
+            'oil': rng.uniform(100, 1000, n_wells * n_months),
+        })
+    return make
+
+
+@pytest.fixture
+def make_histories():
+    """Factory for ``{well: float32 history}`` of random lengths."""
+    def make(n_wells=10, seed=0, min_length=10, max_length=40):
+        rng = np.random.default_rng(seed)
+        return {f'W{i}': rng.uniform(100, 1000, size=rng.integers(min_length, max_length)).astype(np.float32)
+                for i in range(n_wells)}
+    return make
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from src.models.backtest import rolling_origin_backtest, rolling_origin_windows
+from src.models.batch_regression import POLYNOMIAL_MODELS
+from src.models.train_model import split_train_test, train_and_evaluate_single_model
+from sklearn.linear_model import LinearRegression
+
+
+def test_rolling_origin_windows_are_views_ending_at_last_point():
+    values = np.arange(20.0)
+    windows = rolling_origin_windows(values, 6, 3, stride=4)
+
+    assert np.shares_memory(windows, values)
+    assert windows[-1, -1] == values[-1]
+    np.testing.assert_array_equal(windows[:, 0], [3, 7, 11])
+    assert rolling_origin_windows(values[:5], 6, 3).shape == (0, 9)
+
+
+def test_backtest_last_origin_matches_single_split(make_filtered_frame):
+    df = make_filtered_frame(n_wells=4, n_months=50)
+    results = rolling_origin_backtest(df, ['W0', 'W1'], window=24, horizon=12, stride=5,
+                                      models=tuple(POLYNOMIAL_MODELS) + ('Chronos',), pipeline_name='stub')
+
+    assert results.index.names == ['well', 'origin', 'model']
+    assert len(results) == 2 * 3 * 4
+
+    dat = df[df.well_name == 'W0']
+    expected = train_and_evaluate_single_model(LinearRegression(), 'Linear', *split_train_test(dat))
+    last_origin = dat.period.iloc[-12]
+    np.testing.assert_allclose(results.loc[('W0', last_origin, 'Linear'), 'rmse'], expected, rtol=1e-6)
+
+
+def test_backtest_in_worker_processes_matches_serial(make_filtered_frame):
+    df = make_filtered_frame(n_wells=6, n_months=50)
+    wells = list(df.well_name.unique())
+    serial = rolling_origin_backtest(df, wells, stride=3, models=tuple(POLYNOMIAL_MODELS))
+    parallel = rolling_origin_backtest(df, wells, stride=3, models=tuple(POLYNOMIAL_MODELS), n_jobs=2, chunk_wells=2)
+    pd.testing.assert_frame_equal(serial, parallel)
@@ -0,0 +1,46 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import PolynomialFeatures
+
+from src.data.make_dataset import WellStore, load_and_preprocess_data
+from src.features.build_features import calculate_well_characteristics, filter_and_process_data
+from src.models.batch_regression import evaluate_polynomial_batch
+from src.models.train_model import split_train_test, train_and_evaluate_single_model
+
+MODELS = {
+    'Linear': (1, lambda: LinearRegression()),
+    'Polynomial (Degree 2)': (2, lambda: (PolynomialFeatures(degree=2), LinearRegression())),
+    'Polynomial (Degree 3)': (3, lambda: (PolynomialFeatures(degree=3), LinearRegression())),
+}
+
+
+def _assert_matches_sklearn(splits, rtol=1e-6):
+    batched = evaluate_polynomial_batch(splits, {name: degree for name, (degree, _) in MODELS.items()})
+    for name, (_, make_model) in MODELS.items():
+        for well, split in splits.items():
+            expected = train_and_evaluate_single_model(make_model(), name, *split)
+            np.testing.assert_allclose(batched[name][well], expected, rtol=rtol, err_msg=f'{name} {well}')
+
+
+def test_matches_sklearn_on_test_csv(data_path):
+    df, _ = load_and_preprocess_data(data_path)
+    df_filtered, well_list = filter_and_process_data(df, calculate_well_characteristics(df))
+    store = WellStore.from_frame(df_filtered)
+    # Test windows sit ~400 months in, where sklearn's raw cubic features lose about a digit
+    _assert_matches_sklearn({well: split_train_test(store.well(well)) for well in well_list}, rtol=1e-5)
+
+
+def test_matches_sklearn_with_short_and_rank_deficient_windows():
+    rng = np.random.default_rng(0)
+    splits = {}
+    for i, n_months in enumerate([38, 30, 16, 14]):
+        X = np.arange(n_months).reshape(-1, 1) + rng.integers(0, 200)
+        y = rng.uniform(100, 1000, (n_months, 1))
+        splits[f'W{i}'] = split_train_test({'months_since_first_production': X, 'oil': y})
+    _assert_matches_sklearn(splits)
+
+
+def test_well_without_training_points_is_nan():
+    split = split_train_test({'months_since_first_production': np.arange(5), 'oil': np.ones(5)})
+    result = evaluate_polynomial_batch({'W': split}, {'Linear': 1})
+    assert np.isnan(result['Linear']['W'])
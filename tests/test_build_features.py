@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.make_dataset import load_and_preprocess_data
+from src.features.build_features import calculate_gas_decline_rate, calculate_well_characteristics
+
+
+def _reference_well_characteristics(df):
+    # The original per-group implementation, kept as the regression oracle
+    return df.groupby('well_name').agg(
+        average_gas_oil_ratio=pd.NamedAgg(column='gas_total', aggfunc=lambda x: x.mean() / df['oil'].mean()),
+        num_months=pd.NamedAgg(column='period', aggfunc='count'),
+        initial_oil_date=pd.NamedAgg(column='period', aggfunc='min'),
+        average_gas_decline_rate=pd.NamedAgg(column='gas_total', aggfunc=calculate_gas_decline_rate)
+    )
+
+
+def _synthetic_frame(n_wells, n_months, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('1990-01-01') + pd.to_timedelta(rng.integers(0, 3650, n_wells), unit='D')
+    offsets = np.tile(np.arange(n_months), n_wells)
+    df = pd.DataFrame({
+        'oil': rng.uniform(0, 5000, n_wells * n_months),
+        'gas_total': rng.uniform(0, 150000, n_wells * n_months),
+        'period': np.repeat(start.values, n_months) + pd.to_timedelta(offsets * 30, unit='D'),
+        'well_name': np.repeat([f'WELL{i}' for i in range(n_wells)], n_months),
+    })
+    return df.sort_values(by='period').reset_index(drop=True)
+
+
+def _assert_matches_reference(df):
+    expected = _reference_well_characteristics(df)
+    actual = calculate_well_characteristics(df)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+
+def test_matches_reference_on_test_csv(data_path):
+    df, _ = load_and_preprocess_data(data_path)
+    _assert_matches_reference(df)
+
+
+def test_matches_reference_with_single_row_wells():
+    df = _synthetic_frame(50, 30)
+    single = pd.DataFrame({'oil': [10.0], 'gas_total': [5.0], 'period': [pd.Timestamp('2000-01-01')],
+                           'well_name': ['ONLY_ONE']})
+    with pytest.warns(RuntimeWarning):
+        _assert_matches_reference(pd.concat([df, single], ignore_index=True))
+
+
+def test_matches_reference_on_one_million_rows():
+    _assert_matches_reference(_synthetic_frame(5000, 200))
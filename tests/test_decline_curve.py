@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.decline_curve import (arps_cumulative, arps_rate, estimate_eur, fit_arps_batch,
+                                      fit_decline_curves)
+from src.models.train_model import split_train_test, train_and_evaluate_single_model
+
+
+def _declines(n_wells=200, n_months=60, seed=0):
+    rng = np.random.default_rng(seed)
+    qi = rng.uniform(500, 20000, n_wells)
+    di = rng.uniform(0.01, 0.3, n_wells)
+    b = rng.uniform(0.1, 1.5, n_wells)
+    t = np.tile(np.arange(n_months, dtype=float), (n_wells, 1))
+    mask = t < rng.integers(24, n_months, n_wells)[:, None]
+    return t, mask, qi, di, b
+
+
+@pytest.mark.parametrize('kind, b_value', [('exponential', 0.0), ('harmonic', 1.0), ('hyperbolic', None)])
+def test_fit_recovers_exact_declines(kind, b_value):
+    t, mask, qi, di, b = _declines()
+    b = b if b_value is None else np.full_like(b, b_value)
+    q = arps_rate(t, qi[:, None], di[:, None], b[:, None])
+
+    fit = fit_arps_batch(t, np.where(mask, q, 0.0), mask, kind)
+
+    np.testing.assert_allclose(fit['qi'], qi, rtol=1e-6)
+    np.testing.assert_allclose(fit['di'], di, rtol=1e-6)
+    np.testing.assert_allclose(fit['b'], b, rtol=1e-6)
+
+
+@pytest.mark.parametrize('b', [0.0, 0.5, 1.0, 1.5])
+def test_cumulative_matches_integrated_rate(b):
+    t = np.linspace(0, 100, 200001)
+    rate = arps_rate(t, 1000.0, 0.1, b)
+    integrated = np.sum((rate[1:] + rate[:-1]) / 2 * np.diff(t))
+    np.testing.assert_allclose(arps_cumulative(100.0, 1000.0, 0.1, b), integrated, rtol=1e-8)
+
+
+def test_eur_adds_remaining_production_to_date():
+    eur = estimate_eur(1000.0, 0.1, 0.0, t_now=10.0, cumulative_to_date=5000.0, economic_limit=10.0)
+    t_limit = np.log(100.0) / 0.1
+    expected = 5000.0 + arps_cumulative(t_limit, 1000.0, 0.1, 0.0) - arps_cumulative(10.0, 1000.0, 0.1, 0.0)
+    np.testing.assert_allclose(eur, expected)
+
+
+def test_fit_decline_curves_reports_parameters_and_eur():
+    months = np.arange(48)
+    oil = arps_rate(months, 3000.0, 0.05, 0.8)
+    df = pd.DataFrame({'well_name': 'W', 'months_since_first_production': months, 'oil': oil,
+                       'cumulative_oil_production': np.cumsum(oil)})
+
+    curves = fit_decline_curves(df, ['W'], economic_limit=5.0)
+
+    assert list(curves.columns) == ['qi', 'di', 'b', 'eur']
+    np.testing.assert_allclose(curves.loc['W', ['qi', 'di', 'b']], [3000.0, 0.05, 0.8], rtol=1e-6)
+    assert curves.loc['W', 'eur'] > oil.sum()
+
+
+def test_single_model_path_matches_batch():
+    months = np.arange(40)
+    oil = arps_rate(months, 3000.0, 0.05, 0.8) * np.random.default_rng(0).uniform(0.9, 1.1, 40)
+    split = split_train_test({'months_since_first_production': months, 'oil': oil})
+
+    rmse = train_and_evaluate_single_model('hyperbolic', 'Arps (Hyperbolic)', *split)
+    assert np.isfinite(rmse) and rmse < oil.mean()
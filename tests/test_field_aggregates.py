@@ -0,0 +1,55 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.data.make_dataset import load_and_preprocess_data
+from src.features.field_aggregates import (compute_field_aggregates, field_aggregates_cache_path,
+                                           field_aggregates_from_pivot, load_field_aggregates)
+
+
+def test_aggregates_match_dense_pivot_without_mutating_it(data_path):
+    df, series = load_and_preprocess_data(data_path)
+    original = series.copy()
+    aggregates = compute_field_aggregates(df)
+
+    np.testing.assert_allclose(aggregates['oil'], series['oil'].sum(axis=1), rtol=1e-12)
+    np.testing.assert_allclose(aggregates['gas_total'], series['gas_total'].sum(axis=1), rtol=1e-12)
+    np.testing.assert_array_equal(aggregates['producing_wells'],
+                                  series['oil'].apply(lambda x: (x.fillna(0) != 0).sum(), axis=1))
+    np.testing.assert_allclose(aggregates['gor'],
+                               series['gas_total'].sum(axis=1) / (series['oil'].sum(axis=1) + 1e-6), rtol=1e-12)
+    pd.testing.assert_frame_equal(field_aggregates_from_pivot(series), aggregates, check_names=False, rtol=1e-12)
+    pd.testing.assert_frame_equal(series, original)
+
+
+def test_aggregates_cache_is_reused_until_source_changes(tmp_path, data_path):
+    csv_path = str(tmp_path / 'production.csv')
+    shutil.copy(data_path, csv_path)
+    df, _ = load_and_preprocess_data(csv_path, build_pivot=False)
+
+    first = load_field_aggregates(df, csv_path)
+    assert os.path.exists(field_aggregates_cache_path(csv_path))
+    # A cache hit returns the stored frame even when handed different rows
+    pd.testing.assert_frame_equal(load_field_aggregates(df.iloc[:10], csv_path), first)
+
+    with open(csv_path, 'a') as f:
+        f.write('"999999",1.0,1.0,2030-01-01,"NEWWELL"\n')
+    df, _ = load_and_preprocess_data(csv_path, build_pivot=False)
+    updated = load_field_aggregates(df, csv_path)
+    assert updated.index[-1] == pd.Timestamp('2030-01-01')
+    assert updated['producing_wells'].iloc[-1] == 1
+
+
+def test_duplicate_well_months_keep_their_last_row(data_path):
+    df, _ = load_and_preprocess_data(data_path, build_pivot=False)
+    restated = df.iloc[[0, 5]].assign(oil=lambda rows: rows['oil'] * 3 + 1, gas_total=0.0)
+    with_duplicates = pd.concat([df, restated], ignore_index=True)
+
+    aggregates = compute_field_aggregates(with_duplicates)
+    deduplicated = with_duplicates.drop_duplicates(['well_name', 'period'], keep='last')
+    series = deduplicated.pivot(index='period', columns='well_name', values=['oil', 'gas_total'])
+    pd.testing.assert_frame_equal(field_aggregates_from_pivot(series), aggregates, check_names=False, rtol=1e-12)
+    assert aggregates.loc[restated['period'].iloc[0], 'oil'] != compute_field_aggregates(df).loc[
+        restated['period'].iloc[0], 'oil']
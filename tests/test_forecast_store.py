@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.models.forecast_store import QuantileForecasts
+from src.models.predict_model import forecast_wells
+from src.models.stub_pipeline import StubChronosPipeline
+
+
+def test_sample_budget_splits_batches_without_changing_quantiles(make_histories):
+    histories = make_histories()
+    levels = (0.05, 0.5, 0.95)
+    whole = StubChronosPipeline(noise_scale=0.0)
+    chunked = StubChronosPipeline(noise_scale=0.0)
+    expected = forecast_wells(whole, histories, 6, num_samples=8, quantile_levels=levels)
+    # 2 wells x 8 samples x 6 steps per call
+    actual = forecast_wells(chunked, histories, 6, num_samples=8, quantile_levels=levels, max_batch_values=96)
+    assert whole.calls == 1 and chunked.calls == 5
+    for well in histories:
+        assert len(actual[well]) == 3 and actual[well][0].dtype == np.float32
+        for a, b in zip(actual[well], expected[well]):
+            np.testing.assert_allclose(a, b, rtol=1e-6)
+
+
+def test_quantile_forecasts_round_trip(tmp_path, make_histories):
+    levels = (0.1, 0.5, 0.9)
+    forecasts = forecast_wells(StubChronosPipeline(), make_histories(4), 5, num_samples=16, quantile_levels=levels)
+    store = QuantileForecasts.from_dict(forecasts, levels, meta={'num_samples': 16})
+    store.save(str(tmp_path / 'forecasts'))
+    store.save(str(tmp_path / 'forecasts'))
+
+    loaded = QuantileForecasts.load(str(tmp_path / 'forecasts'))
+    assert isinstance(loaded.values, np.memmap) and loaded.values.dtype == np.float32
+    assert loaded.values.shape == (4, 3, 5) and loaded.meta == {'num_samples': 16}
+    assert 'W2' in loaded and 'W9' not in loaded
+    np.testing.assert_array_equal(loaded['W2'][1], forecasts['W2'][1])
+    np.testing.assert_array_equal(loaded.quantile(0.9)[loaded.wells.index('W3')], forecasts['W3'][2])
+
+    frame = loaded.to_frame()
+    assert list(frame.columns) == ['well_name', 'horizon', 'q0.1', 'q0.5', 'q0.9'] and len(frame) == 20
+    np.testing.assert_array_equal(frame.loc[frame['well_name'] == 'W1', 'q0.5'], forecasts['W1'][1])
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ('torch', 'chronos', 'sklearn', 'joblib', 'matplotlib', 'seaborn', 'plotly')
+
+
+def _imported_modules(statement):
+    # -X importtime logs every module the statement imports, to stderr
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+@pytest.mark.parametrize('statement', [
+    'import src',
+    'import src.data',
+    'import src.features',
+    'from src.data import read_production_csv, WellStore, ProductionStream',
+    'from src.features import calculate_well_characteristics, compute_field_aggregates, build_monthly_grid',
+])
+def test_data_and_feature_imports_skip_heavy_dependencies(statement):
+    modules = _imported_modules(statement)
+    assert 'src' in modules
+    heavy = sorted(module for module in modules if module.split('.')[0] in HEAVY)
+    assert not heavy, f'{statement!r} imported {heavy}'
+
+
+def test_exports_load_on_first_access():
+    # importlib.import_module is not logged by -X importtime, so ask the interpreter directly
+    script = ('import sys, src.models; loaded = "src.models.forecast_store" in sys.modules; '
+              'src.models.QuantileForecasts; print(loaded, "src.models.forecast_store" in sys.modules, '
+              '"torch" in sys.modules)')
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ['False', 'True', 'False']
+    assert 'torch' in _imported_modules('import src; src.models.forecast_wells')
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from src.data.incremental import ProductionState, update_production_state
+from src.data.make_dataset import read_production_csv
+from src.features.build_features import calculate_well_characteristics, filter_and_process_data
+
+
+def _expected(df):
+    df_filtered, well_list = filter_and_process_data(df, calculate_well_characteristics(df))
+    return df_filtered.reset_index(drop=True), well_list
+
+
+def test_monthly_updates_match_full_reprocessing(data_path):
+    df = read_production_csv(data_path)
+    months = sorted(df['period'].unique())
+    history = df[df['period'] < months[-6]]
+    state = ProductionState.from_frame(history)
+    state.mark_clean()
+
+    for month in months[-6:]:
+        new_rows = df[df['period'] == month]
+        affected = state.update(new_rows)
+        assert affected == set(new_rows['well_name'])
+
+    expected_df, expected_wells = _expected(df)
+    actual_df, actual_wells = state.filtered()
+    pd.testing.assert_index_equal(actual_wells, expected_wells)
+    pd.testing.assert_frame_equal(actual_df, expected_df)
+    assert state.dirty == set(df[df['period'] >= months[-6]]['well_name'])
+
+
+def test_backfilled_rows_rebuild_only_their_well(data_path):
+    df = read_production_csv(data_path)
+    well = df['well_name'].iloc[0]
+    first_row = df[df.well_name == well].index[0]
+    state = ProductionState.from_frame(df.drop(first_row))
+    state.mark_clean()
+
+    state.update(df.loc[[first_row]])
+
+    expected_df, _ = _expected(df)
+    actual_df, _ = state.filtered()
+    pd.testing.assert_frame_equal(actual_df, expected_df)
+    assert state.dirty == {well}
+
+
+def test_update_production_state_persists(tmp_path, data_path):
+    df = read_production_csv(data_path)
+    last_month = df['period'].max()
+    history_path = tmp_path / 'history.csv'
+    new_path = tmp_path / 'new.csv'
+    state_path = tmp_path / 'state.pkl'
+    df[df['period'] < last_month].to_csv(history_path)
+    df[df['period'] == last_month].to_csv(new_path)
+
+    update_production_state(new_path, state_path, history_file_path=history_path)
+    state = ProductionState.load(state_path)
+
+    assert len(state.df) == len(df)
+    assert state_path.exists()
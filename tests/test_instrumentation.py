@@ -0,0 +1,58 @@
+import json
+import os
+
+from src.instrumentation import RunReport, active_report, record_timing
+from src.models.train_model import train_and_evaluate_models
+
+
+def test_stages_record_time_memory_and_profiles(tmp_path):
+    with RunReport(trace_memory=True, profile='cprofile', profile_dir=str(tmp_path / 'profiles')) as report:
+        assert active_report() is report
+        with report.stage('allocate'):
+            data = [bytes(1 << 20) for _ in range(8)]
+        del data
+    assert active_report() is None
+
+    stage, = report.stages
+    assert stage['name'] == 'allocate'
+    assert stage['wall_s'] >= 0 and stage['cpu_s'] >= 0
+    assert stage['tracemalloc_peak_mb'] >= 8
+    assert os.path.exists(stage['profile'])
+
+    path = report.write(str(tmp_path / 'run_report.json'))
+    with open(path) as f:
+        assert json.load(f)['stages'][0]['name'] == 'allocate'
+
+
+def test_memory_tracing_without_reset_peak(monkeypatch):
+    # Python 3.8 has no tracemalloc.reset_peak
+    import tracemalloc
+    monkeypatch.delattr(tracemalloc, 'reset_peak')
+    with RunReport(trace_memory=True) as report:
+        with report.stage('allocate'):
+            data = bytes(1 << 20)
+        del data
+    stage, = report.stages
+    assert 'tracemalloc_delta_mb' in stage and 'tracemalloc_peak_mb' not in stage
+
+
+def test_training_records_model_timings_and_calls(tmp_path, make_filtered_frame):
+    df = make_filtered_frame()
+    wells = list(df.well_name.unique())
+
+    with RunReport() as report:
+        train_and_evaluate_models(df, wells, cache_dir=str(tmp_path), pipeline_name='stub', chronos_batch_size=4)
+        train_and_evaluate_models(df, wells, cache_dir=str(tmp_path), pipeline_name='stub', chronos_batch_size=4)
+    summary = report.as_dict()
+
+    timings = summary['timings']['train_and_evaluate_models']
+    assert timings['Linear']['wells'] == 6 and timings['Linear']['cache_hits'] == 6
+    assert timings['Chronos']['seconds_per_well'] == timings['Chronos']['seconds'] / 6
+    calls = summary['model_calls']['StubChronosPipeline']
+    assert calls['calls'] == 2 and calls['series'] == 6
+    assert calls['p50_s'] <= calls['max_s']
+
+
+def test_recording_without_a_report_is_a_no_op():
+    record_timing('section', 'key', 1.0, wells=1)
+    assert active_report() is None
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data.make_dataset import WellStore, cache_dir_for, read_production_csv, select_well
+
+
+def _frame():
+    return pd.DataFrame({
+        'well_name': ['B', 'A', 'B', 'C', 'A', 'B'],
+        'period': pd.to_datetime(['2020-01-01', '2020-01-01', '2020-02-01',
+                                  '2020-02-01', '2020-02-01', '2020-03-01']),
+        'oil': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+
+
+def test_well_store_matches_boolean_mask():
+    df = _frame()
+    store = WellStore.from_frame(df)
+
+    assert store.wells == ['A', 'B', 'C']
+    for well in df.well_name.unique():
+        expected = df[df.well_name == well]
+        np.testing.assert_array_equal(store.get(well, 'oil'), expected.oil.values)
+        pd.testing.assert_frame_equal(select_well(store, well), expected.reset_index(drop=True))
+
+
+def test_well_store_returns_views():
+    store = WellStore.from_frame(_frame())
+    assert np.shares_memory(store.get('B', 'oil'), store.columns['oil'])
+    assert store.get('B', 'oil').flags['C_CONTIGUOUS']
+
+
+def test_select_well_missing_well_is_empty():
+    store = WellStore.from_frame(_frame())
+    assert select_well(store, 'Z').empty
+    assert select_well(_frame(), 'Z').empty
+
+
+def _write_csv(path):
+    df = _frame().assign(gas_total=[10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
+    df.to_csv(path)
+    return path
+
+
+def test_binary_cache_round_trip(tmp_path):
+    csv_path = str(_write_csv(tmp_path / 'production.csv'))
+
+    cold = read_production_csv(csv_path, use_cache=True)
+    warm = read_production_csv(csv_path, use_cache=True)
+    plain = read_production_csv(csv_path)
+
+    assert os.path.exists(os.path.join(cache_dir_for(csv_path), 'meta.json'))
+    pd.testing.assert_frame_equal(cold, warm)
+    assert isinstance(warm['well_name'].dtype, pd.CategoricalDtype)
+    assert warm['oil'].dtype == np.float32
+    np.testing.assert_array_equal(warm['well_name'].astype(str), plain['well_name'])
+    np.testing.assert_array_equal(warm['period'], plain['period'])
+    np.testing.assert_allclose(warm['oil'], plain['oil'])
+
+
+def test_binary_cache_is_rebuilt_when_source_changes(tmp_path):
+    csv_path = str(_write_csv(tmp_path / 'production.csv'))
+    read_production_csv(csv_path, use_cache=True)
+
+    df = pd.read_csv(csv_path, index_col=0)
+    df.loc[0, 'oil'] = 1000.0
+    df.to_csv(csv_path)
+
+    assert read_production_csv(csv_path, use_cache=True)['oil'].max() == 1000.0
+
+
+def test_binary_cache_survives_touch(tmp_path, capsys):
+    csv_path = str(_write_csv(tmp_path / 'production.csv'))
+    read_production_csv(csv_path, use_cache=True)
+    os.utime(csv_path, (0, 0))
+    capsys.readouterr()
+
+    read_production_csv(csv_path, use_cache=True)
+    assert 'Loading cached data' in capsys.readouterr().out
+
+    read_production_csv(csv_path, use_cache=True, rebuild_cache=True)
+    assert 'Binary cache written' in capsys.readouterr().out
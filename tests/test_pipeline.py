@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from src.cli import load_config, run
+from src.pipeline import Stage, run_stages, select_stages
+
+
+def _toy_stages(tmp_path, calls, params=1):
+    def record(name, **results):
+        def func(context):
+            calls.append(name)
+            return results
+        return func
+
+    def write(name):
+        def func(context):
+            calls.append(name)
+            with open(tmp_path / f'{name}.txt', 'w') as f:
+                f.write(str(context['value']))
+        return func
+
+    return [
+        Stage('load', record('load', value=params), params=params),
+        Stage('a', write('a'), deps=('load',), outputs=(str(tmp_path / 'a.txt'),)),
+        Stage('b', write('b'), deps=('load',), outputs=(str(tmp_path / 'b.txt'),)),
+    ]
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    state = str(tmp_path / 'state.json')
+    calls = []
+    ran, skipped = run_stages(_toy_stages(tmp_path, calls), state_path=state)
+    assert sorted(ran) == ['a', 'b', 'load'] and not skipped
+
+    calls.clear()
+    ran, skipped = run_stages(_toy_stages(tmp_path, calls), state_path=state)
+    assert not ran and not calls and sorted(skipped) == ['a', 'b', 'load']
+
+    os.remove(tmp_path / 'b.txt')
+    ran, skipped = run_stages(_toy_stages(tmp_path, calls), state_path=state)
+    assert ran == ['load', 'b']
+
+    ran, skipped = run_stages(_toy_stages(tmp_path, calls), state_path=state, forced={'a'})
+    assert ran == ['load', 'a'] and skipped == ['b']
+
+    ran, _ = run_stages(_toy_stages(tmp_path, calls, params=2), state_path=state)
+    assert sorted(ran) == ['a', 'b', 'load']
+    assert (tmp_path / 'a.txt').read_text() == '2'
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other(context):
+        barrier.wait()
+
+    stages = [Stage('load', lambda context: None), Stage('a', wait_for_other, deps=('load',)),
+              Stage('b', wait_for_other, deps=('load',))]
+    ran, _ = run_stages(stages, selected={'a', 'b'}, max_workers=2)
+    assert ran[0] == 'load' and sorted(ran[1:]) == ['a', 'b']
+
+
+def test_stage_selection(tmp_path):
+    stages = _toy_stages(tmp_path, [])
+    assert select_stages(stages, only=['a']) == {'a'}
+    assert select_stages(stages, start='load') == {'load', 'a', 'b'}
+    with pytest.raises(KeyError):
+        select_stages(stages, only=['missing'])
+
+
+def test_cli_runs_selected_stages_from_config(tmp_path, data_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({
+        'data_path': data_path, 'output_dir': str(tmp_path / 'outputs'), 'use_cache': False,
+        'wells': {'subset_size': 5}, 'pipeline': 'stub', 'models': ['Linear', 'Chronos'],
+    }))
+    config = load_config(str(config_path))
+
+    ran, _ = run(config, only=['train', 'decline_curves'])
+    assert set(ran) == {'load', 'characteristics', 'filter', 'train', 'decline_curves'}
+    results = pd.read_csv(tmp_path / 'outputs' / 'model_results.csv', index_col='well_name')
+    assert list(results.columns) == ['Linear', 'Chronos'] and len(results) == 5
+    assert len(pd.read_csv(tmp_path / 'outputs' / 'decline_curves.csv')) == 5
+    with open(tmp_path / 'outputs' / 'run_report.json') as f:
+        assert {stage['name'] for stage in json.load(f)['stages']} == set(ran)
+
+    # Explicitly selected stages rerun even though nothing changed
+    ran, skipped = run(config, only=['train', 'decline_curves'])
+    assert {'train', 'decline_curves'} <= set(ran) and not skipped
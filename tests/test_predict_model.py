@@ -0,0 +1,92 @@
+import numpy as np
+
+from src.models.predict_model import forecast_wells
+from src.models.stub_pipeline import StubChronosPipeline
+from src.models.train_model import evaluate_chronos_batch
+
+
+def test_forecast_wells_matches_one_call_per_well(make_histories):
+    histories = make_histories(min_length=5)
+    pipeline = StubChronosPipeline(noise_scale=0.0)
+
+    batched = forecast_wells(pipeline, histories, 6, batch_size=4)
+    assert pipeline.calls == 3
+
+    for well, history in histories.items():
+        single = forecast_wells(pipeline, {well: history}, 6)[well]
+        for batched_q, single_q in zip(batched[well], single):
+            np.testing.assert_allclose(batched_q, single_q, rtol=1e-5)
+
+
+def test_forecast_wells_returns_ordered_quantiles(make_histories):
+    pipeline = StubChronosPipeline(noise_scale=0.2)
+    forecasts = forecast_wells(pipeline, make_histories(3, min_length=5), 4, num_samples=50)
+
+    for low, median, high in forecasts.values():
+        assert low.shape == median.shape == high.shape == (4,)
+        assert np.all(low <= median) and np.all(median <= high)
+
+
+def test_evaluate_chronos_batch_truncates_to_each_horizon():
+    pipeline = StubChronosPipeline(noise_scale=0.0)
+    windows = {
+        'A': (np.arange(24, dtype=float).reshape(-1, 1), np.arange(12, dtype=float).reshape(-1, 1)),
+        'B': (np.arange(10, dtype=float).reshape(-1, 1), np.arange(5, dtype=float).reshape(-1, 1)),
+        # Too short to train on: left out of the batch, like the regression models
+        'C': (np.empty((0, 1)), np.arange(12, dtype=float).reshape(-1, 1)),
+        'D': (np.arange(2, dtype=float).reshape(-1, 1), np.arange(3, dtype=float).reshape(-1, 1)),
+    }
+    rmse = evaluate_chronos_batch(pipeline, windows, batch_size=8, min_context=3)
+
+    assert pipeline.calls == 1
+    assert set(rmse) == {'A', 'B', 'C', 'D'}
+    assert np.isfinite(rmse['A']) and np.isfinite(rmse['B'])
+    assert np.isnan(rmse['C']) and np.isnan(rmse['D'])
+
+
+def test_registry_loads_each_pipeline_once():
+    from src.models import registry
+
+    loads = []
+    registry.register_loader('counting', lambda: loads.append(1) or StubChronosPipeline())
+    try:
+        first = registry.get_pipeline('counting')
+        registry.init_worker('counting')
+        assert registry.get_pipeline('counting') is first
+        assert loads == [1]
+    finally:
+        registry._LOADERS.pop('counting')
+        registry._PIPELINES.pop('counting', None)
+
+
+def test_registry_loads_once_across_threads():
+    import threading
+    import time
+
+    from src.models import registry
+
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        time.sleep(0.2)
+        return StubChronosPipeline()
+
+    registry.register_loader('slow', slow_loader)
+    barrier = threading.Barrier(4)
+    pipelines = []
+
+    def worker():
+        barrier.wait()
+        pipelines.append(registry.get_pipeline('slow'))
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert loads == [1] and len(pipelines) == 4 and all(p is pipelines[0] for p in pipelines)
+    finally:
+        registry._LOADERS.pop('slow')
+        registry._PIPELINES.pop('slow', None)
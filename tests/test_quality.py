@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from src.data.synthetic import generate_production
+from src.features.build_features import month_index, process_production_rows
+from src.features.quality import build_monthly_grid, flag_production_quality, summarize_production_quality
+
+
+def _frame():
+    # A: duplicate January (restated), February missing, a spike in May, shut in for June
+    return pd.DataFrame({
+        'well_name': ['A'] * 9 + ['B'] * 3,
+        'period': pd.to_datetime(['2000-01-01', '2000-01-31', '2000-03-01', '2000-04-01', '2000-05-01',
+                                  '2000-06-01', '2000-07-01', '2000-08-01', '2000-09-01',
+                                  '2000-03-15', '2000-04-15', '2000-05-15']),
+        'oil': [90.0, 100.0, 95.0, 90.0, 5000.0, 0.0, 80.0, 78.0, 75.0, 10.0, 9.0, 8.5],
+    })
+
+
+def test_month_offsets_follow_the_calendar():
+    periods = pd.date_range('1990-01-01', periods=360, freq='MS')
+    df = pd.DataFrame({'well_name': 'W', 'period': periods, 'oil': 1.0})
+    assert (process_production_rows(df)['months_since_first_production'].to_numpy() == np.arange(360)).all()
+    assert month_index(pd.Series(pd.to_datetime(['1970-01-31', '2000-02-29']))).tolist() == [0, 361]
+
+
+def test_flags_and_summary():
+    flags = flag_production_quality(_frame())
+    a = flags[flags['well_name'] == 'A'].set_index('period')
+    assert a['duplicate'].tolist() == [True] + [False] * 8
+    assert a.loc['2000-03-01', 'gap_months'] == 1 and a['gap_months'].sum() == 1
+    assert a['shut_in'].sum() == 1 and a['outlier'].tolist() == [False] * 4 + [True] + [False] * 4
+
+    summary = summarize_production_quality(flags)
+    assert summary.loc['A'].to_dict() == {'rows': 9, 'duplicates': 1, 'gaps': 1, 'missing_months': 1,
+                                          'shut_in_months': 1, 'outliers': 1}
+    assert summary.loc['B', ['duplicates', 'gaps', 'shut_in_months', 'outliers']].sum() == 0
+
+
+def test_monthly_grid_alignment_and_shut_in():
+    df = _frame()
+    grid = build_monthly_grid(df)
+    assert grid.values.dtype == np.float32 and grid.values.shape == (2, 9)
+    np.testing.assert_array_equal(grid.history('A'), [100, np.nan, 95, 90, 5000, np.nan, 80, 78, 75])
+    np.testing.assert_array_equal(grid.history('B'), [10, 9, 8.5])
+    assert np.isnan(grid.values[1, 3:]).all() and grid.observed.sum() == 10
+
+    zero = build_monthly_grid(df, shut_in='zero', mask_outliers=True)
+    np.testing.assert_array_equal(zero.history('A'), [100, 0, 95, 90, np.nan, 0, 80, 78, 75])
+
+    calendar = build_monthly_grid(df, align='calendar')
+    assert calendar.first.tolist() == [0, 2] and calendar.last.tolist() == [8, 4]
+    right = build_monthly_grid(df, align='last_production')
+    assert right.last.tolist() == [8, 8] and np.isnan(right.values[1, :6]).all()
+
+
+def test_monthly_grid_matches_producing_rows(tmp_path):
+    df = generate_production(50, 60, seed=3)
+    grid = build_monthly_grid(df)
+    processed = process_production_rows(df)
+    for well, rows in processed.groupby('well_name'):
+        history = grid.history(well)
+        months = rows['months_since_first_production'].to_numpy()
+        assert len(history) == months[-1] + 1
+        np.testing.assert_allclose(history[months], rows['oil'], rtol=1e-6)
+
+    loaded = type(grid).load(grid.save(str(tmp_path / 'grid.npz')))
+    np.testing.assert_array_equal(loaded.values, grid.values)
+    assert loaded.wells == grid.wells and loaded.first.tolist() == grid.first.tolist()
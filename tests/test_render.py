@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+from src.visualization.render import FigureSpec, render_figures
+from src.visualization.visualize import build_forecast_figure
+
+
+def _specs(output_dir, n_wells=3, scale=1.0):
+    specs = []
+    for i in range(n_wells):
+        history = np.arange(24.0) * scale
+        specs.append(FigureSpec(build_forecast_figure, os.path.join(output_dir, f'forecast_W{i}.png'),
+                                {'history': history, 'low': history[:6], 'median': history[:6] + 1,
+                                 'high': history[:6] + 2, 'well_name': f'W{i}'}))
+    return specs
+
+
+def test_unchanged_figures_are_skipped(tmp_path):
+    rendered, skipped = render_figures(_specs(str(tmp_path)))
+    assert len(rendered) == 3 and not skipped
+    assert all(os.path.exists(path) for path in rendered)
+
+    rendered, skipped = render_figures(_specs(str(tmp_path)))
+    assert not rendered and len(skipped) == 3
+
+    specs = _specs(str(tmp_path))
+    specs[1].data['median'] = specs[1].data['median'] * 2
+    rendered, skipped = render_figures(specs)
+    assert rendered == [specs[1].output_file] and len(skipped) == 2
+
+
+def test_missing_output_is_rerendered(tmp_path):
+    specs = _specs(str(tmp_path), n_wells=1)
+    render_figures(specs)
+    os.remove(specs[0].output_file)
+
+    rendered, _ = render_figures(specs)
+    assert rendered == [specs[0].output_file]
+
+
+def test_render_in_worker_processes(tmp_path):
+    rendered, _ = render_figures(_specs(str(tmp_path), n_wells=4), n_jobs=2)
+    assert sorted(os.path.basename(path) for path in rendered) == [f'forecast_W{i}.png' for i in range(4)]
+
+
+def test_force_and_builder_changes_rerender(tmp_path, monkeypatch):
+    from src.visualization import render
+
+    specs = _specs(str(tmp_path), n_wells=2)
+    render_figures(specs)
+    rendered, skipped = render_figures(specs, force=True)
+    assert len(rendered) == 2 and not skipped
+
+    before = render.spec_hash(specs[0])
+    monkeypatch.setattr(render, '_library_versions', lambda: 'plotly==0.0.0')
+    assert render.spec_hash(specs[0]) != before
+    monkeypatch.setattr(render, '_builder_code', lambda builder: 'edited')
+    assert len(render_figures(specs)[0]) == 2
+
+
+def test_shared_manifest_survives_threads_and_corruption(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.visualization.render import MANIFEST_NAME
+
+    manifest_path = os.path.join(str(tmp_path), MANIFEST_NAME)
+    with open(manifest_path, 'w') as f:
+        f.write('{"truncated":')
+    groups = [_specs(str(tmp_path / f'group{i}'), n_wells=2) for i in range(4)]
+    for i in range(4):
+        os.makedirs(tmp_path / f'group{i}')
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda specs: render_figures(specs, manifest_path=manifest_path), groups))
+
+    for specs in groups:
+        rendered, skipped = render_figures(specs, manifest_path=manifest_path)
+        assert not rendered and len(skipped) == 2
+    assert not [name for name in os.listdir(tmp_path) if '.tmp' in name]
@@ -0,0 +1,122 @@
+import asyncio
+
+import numpy as np
+
+from src.models.predict_model import forecast_wells
+from src.models.serving import ForecastServer, ForecastService, request_forecast
+from src.models.stub_pipeline import StubChronosPipeline
+
+
+def test_concurrent_requests_are_batched_and_cached(make_histories):
+    histories = make_histories(12)
+    pipeline = StubChronosPipeline(noise_scale=0.0)
+    expected = forecast_wells(StubChronosPipeline(noise_scale=0.0), histories, 6)
+
+    async def scenario():
+        service = ForecastService(pipeline, prediction_length=6, max_batch_size=8, max_wait_ms=50)
+        await service.start()
+        try:
+            first = await asyncio.gather(*(service.forecast(h) for h in histories.values()))
+            again, cached = await service.forecast(histories['W3'])
+            return first, again, cached, dict(service.stats)
+        finally:
+            await service.stop()
+
+    first, again, cached, stats = asyncio.run(scenario())
+    assert pipeline.calls == 2 and stats['batches'] == 2 and stats['batched_requests'] == 12
+    for (quantiles, was_cached), well in zip(first, histories):
+        assert not was_cached
+        for actual, reference in zip(quantiles, expected[well]):
+            np.testing.assert_allclose(actual, reference, rtol=1e-5)
+    assert cached and stats['cache_hits'] == 1
+    np.testing.assert_array_equal(again[1], first[3][0][1])
+
+
+def test_http_server_serves_wells_by_name(make_histories):
+    histories = make_histories(4)
+
+    async def scenario():
+        server = ForecastServer(ForecastService(StubChronosPipeline(noise_scale=0.0), max_wait_ms=5), histories)
+        await server.start(port=0)
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            responses = [await request_forecast(reader, writer, {'well': 'W1', 'horizon': 4}),
+                         await request_forecast(reader, writer, {'history': histories['W1'].tolist(), 'horizon': 4}),
+                         await request_forecast(reader, writer, {'well': 'missing'})]
+            writer.close()
+            return responses
+        finally:
+            await server.stop()
+
+    (status, first), (_, second), (missing_status, _) = asyncio.run(scenario())
+    assert status == 200 and not first['cached'] and second['cached']
+    assert set(first['quantiles']) == {'0.1', '0.5', '0.9'} and len(first['quantiles']['0.5']) == 4
+    assert first['quantiles'] == second['quantiles']
+    assert missing_status == 404
+
+
+def test_invalid_horizons_are_rejected_without_stopping_the_service(make_histories):
+    histories = make_histories(3)
+
+    async def scenario():
+        server = ForecastServer(ForecastService(StubChronosPipeline(noise_scale=0.0), max_wait_ms=20), histories)
+        await server.start(port=0)
+        try:
+            async def ask(payload):
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+                try:
+                    return await request_forecast(reader, writer, payload)
+                finally:
+                    writer.close()
+            first = await asyncio.gather(ask({'well': 'W0', 'horizon': 6}), ask({'well': 'W1', 'horizon': '6'}),
+                                         ask({'well': 'W2', 'horizon': -1}), ask({'well': 'W2', 'horizon': 3}))
+            later = await asyncio.wait_for(ask({'well': 'W1', 'horizon': 2}), timeout=5)
+            return first, later
+        finally:
+            await server.stop()
+
+    first, later = asyncio.run(scenario())
+    assert [status for status, _ in first] == [200, 400, 400, 200]
+    assert len(first[0][1]['quantiles']['0.5']) == 6 and len(first[3][1]['quantiles']['0.5']) == 3
+    assert later[0] == 200 and len(later[1]['quantiles']['0.5']) == 2
+
+
+class _RejectingPipeline(StubChronosPipeline):
+    # Fails any batch holding a context above ``limit``, like an input the model cannot handle
+    def __init__(self, limit, **kwargs):
+        super().__init__(**kwargs)
+        self.limit = limit
+
+    def predict(self, context, *args, **kwargs):
+        if any(float(c.nan_to_num().max()) > self.limit for c in (context if isinstance(context, list) else context)):
+            raise RuntimeError('context out of range')
+        return super().predict(context, *args, **kwargs)
+
+
+def test_malformed_requests_fail_alone(make_histories):
+    histories = make_histories(3)
+
+    async def scenario():
+        server = ForecastServer(ForecastService(_RejectingPipeline(1e6, noise_scale=0.0), max_wait_ms=50), histories)
+        await server.start(port=0)
+        try:
+            async def ask(payload):
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+                try:
+                    return await request_forecast(reader, writer, payload)
+                finally:
+                    writer.close()
+            shaped = await asyncio.gather(ask({'well': 'W0'}), ask({'history': [[1, 2], [3, 4]]}),
+                                          ask({'history': [1.0, float('nan')]}), ask({'well': 'W1'}))
+            # Passes validation but breaks the model: only its own request fails
+            service = server.service
+            batched = await asyncio.gather(service.forecast(histories['W2'], 4), service.forecast([1e9, 2e9], 4),
+                                           return_exceptions=True)
+            return shaped, batched
+        finally:
+            await server.stop()
+
+    shaped, batched = asyncio.run(scenario())
+    assert [status for status, _ in shaped] == [200, 400, 400, 200]
+    assert len(batched[0][0][1]) == 4
+    assert isinstance(batched[1], RuntimeError)
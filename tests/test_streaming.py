@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data.make_dataset import load_and_preprocess_data
+from src.data.streaming import ProductionStream, stream_production_csv
+from src.features.build_features import calculate_well_characteristics, filter_and_process_data
+
+
+def test_field_totals_match_pivot(data_path):
+    _, series = load_and_preprocess_data(data_path)
+    with ProductionStream(data_path, chunksize=5000, partition_bytes=1 << 18) as stream:
+        totals = stream.field_totals
+        assert stream.n_partitions > 1
+
+    np.testing.assert_allclose(totals['oil'], series['oil'].sum(axis=1), rtol=1e-12)
+    np.testing.assert_allclose(totals['gas_total'], series['gas_total'].sum(axis=1), rtol=1e-12)
+    np.testing.assert_array_equal(totals['producing_wells'], (series['oil'].fillna(0) != 0).sum(axis=1))
+    pd.testing.assert_index_equal(totals.index, series.index, check_names=False)
+
+
+def test_processed_wells_match_in_memory_pipeline(data_path):
+    df, _ = load_and_preprocess_data(data_path)
+    well_characteristics = calculate_well_characteristics(df)
+    expected, well_list = filter_and_process_data(df, well_characteristics)
+
+    with ProductionStream(data_path, chunksize=5000, partition_bytes=1 << 18) as stream:
+        wells = dict(stream.iter_processed_wells())
+        streamed_characteristics = stream.well_characteristics
+
+    assert sorted(wells) == sorted(well_list)
+    for well_name, frame in wells.items():
+        pd.testing.assert_frame_equal(frame.reset_index(drop=True),
+                                      expected[expected.well_name == well_name].reset_index(drop=True))
+    pd.testing.assert_frame_equal(streamed_characteristics, well_characteristics.sort_index(),
+                                  check_names=False, rtol=1e-12)
+
+
+def test_stream_yields_every_row_once_and_cleans_up(tmp_path, data_path):
+    df, _ = load_and_preprocess_data(data_path)
+    frames = list(stream_production_csv(data_path, chunksize=7000, partition_bytes=1 << 18, tmp_dir=tmp_path))
+
+    assert len(frames) == len({name for name, _ in frames}) == df.well_name.nunique()
+    assert sum(len(frame) for _, frame in frames) == len(df)
+    assert all(frame['period'].is_monotonic_increasing for _, frame in frames)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from src.data.make_dataset import read_production_csv
+from src.data.synthetic import generate_production, write_production_csv
+
+
+def test_synthetic_field_round_trips_through_the_csv_reader(tmp_path):
+    df = generate_production(50, 36, seed=1)
+    path = write_production_csv(df, str(tmp_path / 'production.csv'))
+
+    with open(path) as f:
+        assert f.readline().strip() == ',oil,gas_total,period,well_name'
+    loaded = read_production_csv(path)
+    assert list(loaded.columns) == ['oil', 'gas_total', 'period', 'well_name']
+    assert len(loaded) == len(df) and loaded['well_name'].nunique() == 50
+    assert pd.api.types.is_datetime64_any_dtype(loaded['period'])
+    assert (loaded['period'].dt.day == 1).all()
+
+
+def test_synthetic_wells_decline_with_gaps_and_shut_ins():
+    df = generate_production(200, 60, seed=0, gap_rate=0.05, shut_in_rate=0.05)
+
+    assert 0.9 * 200 * 60 < len(df) < 200 * 60
+    assert ((df['oil'] == 0) & (df['gas_total'] == 0)).mean() > 0.02
+    producing = df[df['oil'] > 0].sort_values(['well_name', 'period'])
+    first = producing.groupby('well_name')['oil'].apply(lambda oil: oil.iloc[:6].mean())
+    last = producing.groupby('well_name')['oil'].apply(lambda oil: oil.iloc[-6:].mean())
+    assert (last < first).mean() > 0.95
+    assert producing['period'].nunique() > 60
+    pd.testing.assert_frame_equal(generate_production(5, 12, seed=3), generate_production(5, 12, seed=3))
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from src.models.result_cache import ResultCache
+from src.models.train_model import train_and_evaluate_models
+
+
+def test_results_are_cached_per_well_and_model(tmp_path, capsys, make_filtered_frame):
+    df = make_filtered_frame()
+    wells = list(df.well_name.unique())
+
+    first = train_and_evaluate_models(df, wells, cache_dir=str(tmp_path), pipeline_name='stub')
+    assert 'Result cache: 0 hits, 42 misses' in capsys.readouterr().out
+
+    second = train_and_evaluate_models(df, wells, cache_dir=str(tmp_path), pipeline_name='stub')
+    assert 'Result cache: 42 hits, 0 misses' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(first, second)
+
+    df.loc[df.well_name == 'W0', 'oil'] *= 2
+    third = train_and_evaluate_models(df, wells, cache_dir=str(tmp_path), pipeline_name='stub')
+    assert 'Result cache: 35 hits, 7 misses' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(third.drop('W0'), first.drop('W0'))
+    assert list(third.index) == wells
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.pkl'), max_entries=2)
+    cache.put('a', 1.0)
+    cache.put('b', 2.0)
+    cache.get('a')
+    cache.put('c', 3.0)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1.0 and cache.get('c') == 3.0
+
+    cache.save()
+    assert len(ResultCache(str(tmp_path / 'cache.pkl'), max_entries=2)) == 2